@@ -158,8 +158,10 @@ def apply_low_latency_settings():
 
 def benchmark_latency():
     """Simple latency benchmark tool"""
+    import statistics
     import time
     import requests
+    from requests.adapters import HTTPAdapter
     
     print("\n📊 Latency Benchmark Tool")
     print("-" * 30)
@@ -170,45 +172,50 @@ def benchmark_latency():
     
     print(f"\n🔍 Testing latency to {pi_url}")
     
-    # Test command latency
+    # One keep-alive session for the whole run - measures command RTT, not handshakes
+    http = requests.Session()
+    http.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=0))
+    http.headers.update({"Connection": "keep-alive"})
+    
+    # Test command latency - sample 0 opens the connection and is not counted
+    stop_body = b'{"direction":"S"}'  # encoded once, not per request
     command_times = []
-    for i in range(10):
+    for i in range(11):
         try:
-            start_time = time.time()
-            response = requests.post(f"{pi_url}/move", 
-                                   json={"direction": "S"}, 
-                                   timeout=2)
-            end_time = time.time()
+            start_time = time.perf_counter()
+            response = http.post(f"{pi_url}/move", 
+                               data=stop_body, headers={"Content-Type": "application/json"},
+                               timeout=2)
+            latency = (time.perf_counter() - start_time) * 1000
             
-            if response.status_code == 200:
-                latency = (end_time - start_time) * 1000
+            if i == 0:
+                print(f"   Warm-up: {latency:.1f}ms (connection setup, not counted)")
+            elif response.status_code == 200:
                 command_times.append(latency)
-                print(f"   Test {i+1}: {latency:.1f}ms")
+                print(f"   Test {i}: {latency:.1f}ms")
             else:
-                print(f"   Test {i+1}: ERROR {response.status_code}")
+                print(f"   Test {i}: ERROR {response.status_code}")
                 
         except Exception as e:
-            print(f"   Test {i+1}: TIMEOUT/ERROR")
-        
-        time.sleep(0.1)
+            print(f"   Test {i}: TIMEOUT/ERROR")
     
     if command_times:
-        avg_latency = sum(command_times) / len(command_times)
+        median_latency = statistics.median(command_times)
         min_latency = min(command_times) 
         max_latency = max(command_times)
         
         print(f"\n📊 Command Latency Results:")
-        print(f"   Average: {avg_latency:.1f}ms")
+        print(f"   Median: {median_latency:.1f}ms")
         print(f"   Best: {min_latency:.1f}ms")
         print(f"   Worst: {max_latency:.1f}ms")
         
-        if avg_latency > 300:
+        if median_latency > 300:
             print(f"\n⚠️  High latency detected! Consider:")
             print(f"   • Check Wi-Fi signal strength")
             print(f"   • Use wired connection if possible") 
             print(f"   • Apply low latency settings")
             print(f"   • Restart Pi and router")
-        elif avg_latency > 150:
+        elif median_latency > 150:
             print(f"\n👍 Moderate latency - low latency mode recommended")
         else:
             print(f"\n🚀 Excellent latency - your setup is optimized!")
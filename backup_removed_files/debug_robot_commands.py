@@ -12,9 +12,27 @@ Usage: python debug_robot_commands.py
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import socket
 import time
 import sys
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+class LowLatencyHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets flush tiny command bodies immediately (no Nagle)"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+# Pre-encoded /move bodies - one per ESP32 command letter
+MOVE_JSON_BODIES = {c: b'{"direction":"%s"}' % c.encode() for c in 'FBLRS'}
+
 
 class RobotDebugger:
     def __init__(self):
@@ -23,11 +41,20 @@ class RobotDebugger:
         self.PI_PORT = 5000
         self.BASE_URL = f"http://{self.PI_IP}:{self.PI_PORT}"
         
+        # Keep-alive, no-Nagle session so every test command reuses one TCP connection
+        self.http = requests.Session()
+        # Same retry/pool policy as the controller: retry connects and 502-504 once, never reads
+        retry = Retry(total=1, connect=1, read=0, backoff_factor=0, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(['GET', 'POST']), raise_on_status=False)
+        self.http.mount('http://', LowLatencyHTTPAdapter(pool_connections=1, pool_maxsize=4, pool_block=True,
+                                                      max_retries=retry))
+        self.http.headers.update({"Connection": "keep-alive"})
+        
     def test_connection(self):
         """Test basic connection to Pi"""
         print("🔗 Testing Pi connection...")
         try:
-            response = requests.get(f"{self.BASE_URL}/status", timeout=5)
+            response = self.http.get(f"{self.BASE_URL}/status", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 print(f"   ✅ Pi server: {data.get('status', 'unknown')}")
@@ -48,10 +75,11 @@ class RobotDebugger:
         print(f"\n📤 Testing command: {command}")
         try:
             url = f"{self.BASE_URL}/move"
-            data = {"direction": command}
+            body = MOVE_JSON_BODIES.get(command) or json.dumps({"direction": command}).encode()
             
             start_time = time.time()
-            response = requests.post(url, json=data, timeout=5)
+            response = self.http.post(url, data=body, headers={"Content-Type": "application/json"},
+                                      timeout=5)
             response_time = (time.time() - start_time) * 1000
             
             print(f"   ⏱️ Response time: {response_time:.1f}ms")
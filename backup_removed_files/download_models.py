@@ -1,23 +1,37 @@
 import urllib.request
 import os
+import time
 import requests
 
+CHUNK_SIZE = 1024 * 1024  # 1 MiB reads - a handful of Python iterations per model
+
+# Shared session so consecutive downloads reuse one connection
+session = requests.Session()
+
 def download_file(url, filename):
-    """Download file with progress indicator"""
-    response = requests.get(url, stream=True)
-    total_size = int(response.headers.get('content-length', 0))
-    
-    with open(filename, 'wb') as file:
-        downloaded = 0
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
+    """Download file with progress indicator (updated about once per second)"""
+    with session.get(url, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        total_size = int(response.headers.get('content-length', 0))
+        
+        with open(filename, 'wb') as file:
+            downloaded = 0
+            next_report = 0.0
+            while True:
+                chunk = response.raw.read(CHUNK_SIZE)
+                if not chunk:
+                    break
                 file.write(chunk)
                 downloaded += len(chunk)
-                if total_size > 0:
-                    percent = min((downloaded / total_size) * 100, 100.0)
-                    print(f"\rDownloading {filename}: {percent:.1f}%", end='', flush=True)
-                else:
-                    print(f"\rDownloading {filename}: {downloaded} bytes", end='', flush=True)
+                now = time.monotonic()
+                if now >= next_report:
+                    next_report = now + 1.0
+                    if total_size > 0:
+                        percent = min((downloaded / total_size) * 100, 100.0)
+                        print(f"\rDownloading {filename}: {percent:.1f}%", end='', flush=True)
+                    else:
+                        print(f"\rDownloading {filename}: {downloaded} bytes", end='', flush=True)
     print(f"\n✓ Downloaded {filename}")
     return downloaded
 
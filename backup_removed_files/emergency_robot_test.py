@@ -13,9 +13,24 @@ Run this FIRST before anything else!
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import json
 
+# One keep-alive connection for every /status and /move call - no handshake per command
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+SESSION.headers["Connection"] = "keep-alive"
+
+# /move bodies serialized once - the loops below only index into this
+_CT = {"Content-Type": "application/json"}
+_BODY = {c: json.dumps({"direction": c}).encode("ascii") for c in "FBLRS"}
+
+def get_status(base_url):
+    """GET /status as (HTTP code, JSON dict or None)"""
+    response = SESSION.get(f"{base_url}/status", timeout=5)
+    return response.status_code, (response.json() if response.status_code == 200 else None)
+
 def test_step_by_step():
     print("🚨 EMERGENCY ROBOT DEBUG")
     print("=" * 50)
@@ -32,16 +47,15 @@ def test_step_by_step():
     # Step 2: Test Pi server
     print("\n📡 Step 2: Testing Pi Server...")
     try:
-        response = requests.get(f"{base_url}/status", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
+        status_code, data = get_status(base_url)
+        if status_code == 200:
             print("✅ Pi server is running!")
             print(f"   Pi Status: {data.get('status')}")
             print(f"   UART Status: {data.get('uart_status')}")
             print(f"   Camera Status: {data.get('camera_status')}")
             print(f"   Commands Received: {data.get('commands_received')}")
         else:
-            print(f"❌ Pi server error: HTTP {response.status_code}")
+            print(f"❌ Pi server error: HTTP {status_code}")
             return False
     except Exception as e:
         print(f"❌ Cannot connect to Pi: {e}")
@@ -52,36 +66,63 @@ def test_step_by_step():
     print("\n🎮 Step 3: Testing Commands...")
     commands = ['S', 'F', 'B', 'L', 'R']
     
-    for cmd in commands:
-        print(f"\n   Testing command: {cmd}")
-        try:
-            cmd_data = {"direction": cmd}
-            response = requests.post(f"{base_url}/move", json=cmd_data, timeout=5)
-            
-            if response.status_code == 200:
-                result = response.json()
+    # One request for the whole sequence - the Pi paces the commands 1 s apart itself
+    results = None
+    try:
+        response = SESSION.post(f"{base_url}/batch_move",
+                                json={"pipeline": [{"direction": cmd} for cmd in commands],
+                                      "inter_delay_ms": 1000},
+                                timeout=len(commands) + 5)
+        if response.status_code == 200:
+            results = response.json().get('results')
+        elif response.status_code != 404:
+            print(f"   ⚠️ Batch move failed: HTTP {response.status_code} - sending one by one")
+    except Exception as e:
+        print(f"   ⚠️ Batch move error: {e} - sending one by one")
+    
+    if results is not None:
+        for cmd, result in zip(commands, results):
+            print(f"\n   Testing command: {cmd}")
+            if result.get('status') == 'success':
                 print(f"   ✅ Command {cmd}: {result.get('status')}")
                 print(f"      UART: {result.get('uart_status')}")
                 print(f"      Message: {result.get('message')}")
             else:
-                print(f"   ❌ Command {cmd} failed: HTTP {response.status_code}")
-                try:
-                    error = response.json()
-                    print(f"      Error: {error.get('message')}")
-                except:
-                    print(f"      Raw error: {response.text}")
-                    
-        except Exception as e:
-            print(f"   ❌ Command {cmd} error: {e}")
-            
-        time.sleep(1)  # Wait between commands
+                print(f"   ❌ Command {cmd} failed")
+                print(f"      Error: {result.get('message')}")
+    else:
+        # Older Pi server without /batch_move
+        for cmd in commands:
+            print(f"\n   Testing command: {cmd}")
+            step_start = time.monotonic()
+            try:
+                response = SESSION.post(f"{base_url}/move", data=_BODY[cmd], headers=_CT, timeout=5)
+                
+                if response.status_code == 200:
+                    result = response.json()
+                    print(f"   ✅ Command {cmd}: {result.get('status')}")
+                    print(f"      UART: {result.get('uart_status')}")
+                    print(f"      Message: {result.get('message')}")
+                else:
+                    print(f"   ❌ Command {cmd} failed: HTTP {response.status_code}")
+                    try:
+                        error = response.json()
+                        print(f"      Error: {error.get('message')}")
+                    except:
+                        print(f"      Raw error: {response.text}")
+                        
+            except Exception as e:
+                print(f"   ❌ Command {cmd} error: {e}")
+                
+            # Commands start 1 s apart - the request and printing already used part of that
+            time.sleep(max(0.0, 1.0 - (time.monotonic() - step_start)))
     
     # Step 4: Check current status
     print("\n📊 Step 4: Final Status Check...")
     try:
-        response = requests.get(f"{base_url}/status", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
+        status_code, final_data = get_status(base_url)
+        if status_code == 200:
+            data = final_data  # diagnose from the fresh status; keep step 2's if this fails
             print(f"✅ Commands processed: {data.get('commands_received')}")
             print(f"   Last command: {data.get('last_command')}")
             print(f"   UART status: {data.get('uart_status')}")
@@ -128,7 +169,7 @@ def quick_single_command():
     print(f"📤 Sending: {data} to {url}")
     
     try:
-        response = requests.post(url, json=data, timeout=3)
+        response = SESSION.post(url, data=_BODY[cmd], headers=_CT, timeout=3)
         print(f"📥 Response: {response.status_code}")
         
         if response.status_code == 200:
@@ -147,7 +188,10 @@ if __name__ == "__main__":
     
     choice = input("Enter 1 or 2: ").strip()
     
-    if choice == "1":
-        test_step_by_step()
-    else:
-        quick_single_command()
\ No newline at end of file
+    try:
+        if choice == "1":
+            test_step_by_step()
+        else:
+            quick_single_command()
+    finally:
+        SESSION.close()
\ No newline at end of file
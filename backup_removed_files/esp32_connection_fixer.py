@@ -8,30 +8,58 @@ Handles common ESP32 Bluetooth connection issues.
 """
 
 import bluetooth
+import functools
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 BT_CAR_32_MAC = "1C:69:20:A4:30:2A"
 
+# SPP channel per MAC from SDP - survives the reset/pair retries in main()
+_channel_cache = {}
+
+# RFCOMM connect timeout per MAC: starts short, doubles after each timeout up to the old fixed 8 s
+_connect_timeouts = {}
+MIN_CONNECT_TIMEOUT = 2.0   # a Bluetooth page + RFCOMM setup alone can take over a second
+MAX_CONNECT_TIMEOUT = 8.0
+
+def _resolve_channel(mac):
+    """Look up the Serial Port Profile channel with one SDP query (cached per MAC)"""
+    if mac in _channel_cache:
+        return _channel_cache[mac]
+    try:
+        services = bluetooth.find_service(address=mac, uuid=bluetooth.SERIAL_PORT_CLASS)
+    except Exception as e:
+        print(f"   ⚠️ SDP lookup failed: {e}")
+        services = []
+    if not services:
+        return None
+    _channel_cache[mac] = services[0]["port"]
+    return _channel_cache[mac]
+
 def test_connection_methods():
     """Try different connection methods for ESP32"""
     
     print("🔧 Testing ESP32 Connection Methods")
     print("=" * 40)
     
-    # Method 1: Standard RFCOMM Channel 1
-    print("📞 Method 1: Standard RFCOMM Channel 1...")
-    if test_rfcomm_connection(1):
-        return True
-    
-    time.sleep(2)
-    
-    # Method 2: Try different channels
-    for channel in [0, 2, 3, 4, 5]:
-        print(f"📞 Method 2: Trying RFCOMM Channel {channel}...")
-        if test_rfcomm_connection(channel):
+    # Method 1: Ask the ESP32 which channel its serial port is on (one SDP query)
+    print("📞 Method 1: Serial port channel lookup (SDP)...")
+    resolved = _resolve_channel(BT_CAR_32_MAC)
+    if resolved is not None:
+        print(f"   📋 Serial port advertised on channel {resolved}")
+        if test_rfcomm_connection(resolved):
             return True
-        time.sleep(1)
+        _channel_cache.pop(BT_CAR_32_MAC, None)  # stale after a reset - look it up again
+    else:
+        print("   ❌ No serial port service advertised")
+    
+    # Method 2: SDP didn't help - try the usual channels all at once
+    channels = [c for c in [1, 0, 2, 3, 4, 5] if c != resolved]
+    print(f"📞 Method 2: Trying RFCOMM channels {channels} in parallel...")
+    channel, sock = open_first_channel(channels)
+    if sock is not None and probe_connection(sock, channel):
+        return True
     
     # Method 3: Service discovery
     print("📞 Method 3: Service discovery...")
@@ -41,15 +69,56 @@ def test_connection_methods():
     print("❌ All connection methods failed")
     return False
 
-def test_rfcomm_connection(channel):
-    """Test RFCOMM connection on specific channel"""
+def open_rfcomm(channel, timeout=None):
+    """Connect an RFCOMM socket to the ESP32 on one channel (raises on failure)"""
+    if timeout is None:
+        timeout = _connect_timeouts.get(BT_CAR_32_MAC, MIN_CONNECT_TIMEOUT)
+    sock = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
     try:
-        sock = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
-        sock.settimeout(8)
-        
-        print(f"   🔗 Connecting to channel {channel}...")
+        sock.settimeout(timeout)
         sock.connect((BT_CAR_32_MAC, channel))
-        
+    except Exception as e:
+        sock.close()
+        if 'timed out' in str(e):
+            # Derived from the timeout this attempt used, so parallel timeouts double it once
+            _connect_timeouts[BT_CAR_32_MAC] = min(MAX_CONNECT_TIMEOUT, timeout * 2)
+        raise
+    return sock
+
+def open_first_channel(channels):
+    """Connect to every channel concurrently, returns (channel, sock) of the first success.
+
+    The connect timeouts overlap instead of adding up. Connects still in flight
+    when a winner is found are left to finish in the background and their
+    sockets are closed as they complete.
+    """
+    pool = ThreadPoolExecutor(max_workers=len(channels))
+    futures = {pool.submit(open_rfcomm, channel): channel for channel in channels}
+    winner = (None, None)
+    try:
+        for future in as_completed(futures):
+            channel = futures[future]
+            try:
+                sock = future.result()
+            except Exception as e:
+                print(f"   ❌ Channel {channel} failed: {e}")
+                continue
+            winner = (channel, sock)
+            break
+    finally:
+        for future in futures:
+            if futures[future] != winner[0]:
+                future.add_done_callback(_close_late_socket)
+        pool.shutdown(wait=False)
+    return winner
+
+def _close_late_socket(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def probe_connection(sock, channel):
+    """Send STOP over an open connection, report any reply, then close it"""
+    try:
         print(f"   ✅ Connected on channel {channel}!")
         
         # Test communication
@@ -68,9 +137,20 @@ def test_rfcomm_connection(channel):
         return True
         
     except Exception as e:
+        sock.close()
         print(f"   ❌ Channel {channel} failed: {e}")
         return False
 
+def test_rfcomm_connection(channel):
+    """Test RFCOMM connection on specific channel"""
+    try:
+        print(f"   🔗 Connecting to channel {channel}...")
+        sock = open_rfcomm(channel)
+    except Exception as e:
+        print(f"   ❌ Channel {channel} failed: {e}")
+        return False
+    return probe_connection(sock, channel)
+
 def test_service_discovery():
     """Discover available services on ESP32"""
     try:
@@ -123,24 +203,33 @@ def pair_device():
             "pairable on",
             f"pair {BT_CAR_32_MAC}",
             f"trust {BT_CAR_32_MAC}",
-            f"connect {BT_CAR_32_MAC}",
-            "quit"
+            f"connect {BT_CAR_32_MAC}"
         ]
         
+        # One bluetoothctl session for the whole script instead of a process per command
         for cmd in commands:
             print(f"   📞 Running: {cmd}")
-            result = subprocess.run(['bluetoothctl'], 
-                                  input=cmd + '\n', 
-                                  text=True, 
-                                  capture_output=True, 
-                                  timeout=10)
-            
-            if "Failed" in result.stdout or "Failed" in result.stderr:
-                print(f"   ⚠️ Command might have failed: {cmd}")
-            else:
-                print(f"   ✅ Command completed: {cmd}")
-            
-            time.sleep(1)
+        proc = subprocess.Popen(['bluetoothctl'],
+                                stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                text=True)
+        try:
+            proc.stdin.write("\n".join(commands) + "\n")
+            proc.stdin.flush()
+            # pair/connect finish asynchronously - one settle before quitting, not one per command
+            time.sleep(2)
+            out, err = proc.communicate("quit\n", timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            out, err = proc.communicate()
+        
+        failures = [line.strip() for line in (out + err).splitlines() if "Failed" in line]
+        if failures:
+            for line in failures:
+                print(f"   ⚠️ bluetoothctl: {line}")
+        else:
+            print("   ✅ bluetoothctl commands completed")
         
         return True
         
@@ -148,6 +237,17 @@ def pair_device():
         print(f"   ❌ Pairing failed: {e}")
         return False
 
+@functools.lru_cache(maxsize=4)
+def _adapter_sees(mac, bucket):
+    try:
+        return any(addr == mac for addr, _ in bluetooth.discover_devices(duration=1, lookup_names=True))
+    except Exception:
+        return False
+
+def _adapter_healthy(mac):
+    """True if a ~1 s inquiry finds the device (answer reused for 30 s)"""
+    return _adapter_sees(mac, int(time.monotonic() // 30))
+
 def reset_bluetooth():
     """Reset Bluetooth adapter"""
     print("🔄 Resetting Bluetooth adapter...")
@@ -164,9 +264,10 @@ def reset_bluetooth():
             "sleep 3"
         ]
         
+        # Whole sequence in one shell rather than a /bin/sh per step
         for cmd in commands:
             print(f"   🔧 {cmd}")
-            subprocess.run(cmd, shell=True, timeout=15)
+        subprocess.run(["bash", "-c", "; ".join(commands)], timeout=30, check=False)
         
         print("   ✅ Bluetooth reset completed")
         return True
@@ -191,9 +292,12 @@ def main():
     
     print("\n❌ Direct connection failed. Trying advanced fixes...")
     
-    # Step 2: Reset Bluetooth
-    print("\n🚀 Step 2: Resetting Bluetooth...")
-    reset_bluetooth()
+    # Step 2: Reset Bluetooth - only when the adapter can't even see the ESP32
+    if _adapter_healthy(BT_CAR_32_MAC):
+        print("\n🚀 Step 2: Adapter sees BT_CAR_32 - skipping Bluetooth reset")
+    else:
+        print("\n🚀 Step 2: Resetting Bluetooth...")
+        reset_bluetooth()
     
     # Step 3: Try pairing
     print("\n🚀 Step 3: Attempting pairing...")
@@ -94,8 +94,10 @@ void loop() {
   if (Serial2.available() > 0) {
     char incomingByte = Serial2.read();
     
-    // Process single character commands
-    if (incomingByte == '\n' || incomingByte == '\r') {
+    // Process single character commands - the Pi sends bare opcodes, no delimiter
+    if (receivedCommand.length() == 0 && strchr("FBLRS", incomingByte) != NULL && incomingByte != '\0') {
+      processCommand(String(incomingByte));
+    } else if (incomingByte == '\n' || incomingByte == '\r') {
       if (receivedCommand.length() > 0) {
         processCommand(receivedCommand);
         receivedCommand = "";
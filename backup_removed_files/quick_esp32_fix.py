@@ -8,9 +8,16 @@ Direct connection test for BT_CAR_32 with multiple methods.
 import subprocess
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 BT_CAR_32_MAC = "1C:69:20:A4:30:2A"
 
+# SPP channel per MAC from SDP, reused by the retests after restart/repair
+_channel_cache = {}
+
+# Connect timeout per MAC - 2 s first, doubled after a timeout, never past the old 5 s
+_connect_timeouts = {}
+
 def run_cmd(cmd):
     """Run shell command and return success"""
     try:
@@ -19,6 +26,83 @@ def run_cmd(cmd):
     except:
         return False, "", "timeout"
 
+def _resolve_channel(bluetooth, mac):
+    """Serial Port Profile channel from one SDP query (cached per MAC), or None"""
+    if mac not in _channel_cache:
+        try:
+            services = bluetooth.find_service(address=mac, uuid=bluetooth.SERIAL_PORT_CLASS)
+        except Exception as e:
+            print(f"⚠️ SDP lookup failed: {e}")
+            services = []
+        if not services:
+            return None
+        _channel_cache[mac] = services[0]["port"]
+    return _channel_cache[mac]
+
+def _open_channel(bluetooth, channel):
+    """Connected RFCOMM socket on one channel (raises on failure)"""
+    timeout = _connect_timeouts.get(BT_CAR_32_MAC, 2.0)
+    sock = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect((BT_CAR_32_MAC, channel))
+    except Exception as e:
+        sock.close()
+        if 'timed out' in str(e):
+            _connect_timeouts[BT_CAR_32_MAC] = min(5.0, timeout * 2)
+        raise
+    return sock
+
+def _close_late_socket(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def _open_first_channel(bluetooth, channels):
+    """Try all channels at once so their timeouts overlap, returns (channel, sock) or (None, None)"""
+    pool = ThreadPoolExecutor(max_workers=len(channels))
+    futures = {pool.submit(_open_channel, bluetooth, channel): channel for channel in channels}
+    winner = (None, None)
+    try:
+        for future in as_completed(futures):
+            channel = futures[future]
+            try:
+                winner = (channel, future.result())
+                break
+            except Exception as e:
+                print(f"❌ Channel {channel} failed: {e}")
+    finally:
+        # Connects still running can't be interrupted - close their sockets when they land
+        for future, channel in futures.items():
+            if channel != winner[0]:
+                future.add_done_callback(_close_late_socket)
+        pool.shutdown(wait=False)
+    return winner
+
+def _probe_channel(sock, channel):
+    """Send STOP on a fresh connection and report the ESP32's reply"""
+    try:
+        print(f"✅ SUCCESS! Connected on channel {channel}")
+        
+        # Send test command
+        sock.send(b'S\n')
+        print("📤 Sent STOP command")
+        
+        # Try to get response
+        try:
+            sock.settimeout(2)
+            response = sock.recv(1024).decode().strip()
+            print(f"📥 ESP32 response: '{response}'")
+        except:
+            print("📥 No response (normal for some ESP32s)")
+        
+        print(f"🎉 Channel {channel} is working!")
+        return True
+    except Exception as e:
+        print(f"❌ Channel {channel} failed: {e}")
+        return False
+    finally:
+        sock.close()
+
 def test_python_bluetooth():
     """Test Python Bluetooth connection"""
     print("🐍 Testing Python Bluetooth Connection")
@@ -28,35 +112,24 @@ def test_python_bluetooth():
         import bluetooth
         print("✅ Python bluetooth module loaded")
         
-        # Test different channels
-        for channel in [1, 0, 2, 3]:
-            print(f"📞 Trying RFCOMM channel {channel}...")
+        # Advertised serial port channel first
+        channels = [1, 0, 2, 3]
+        resolved = _resolve_channel(bluetooth, BT_CAR_32_MAC)
+        if resolved is not None:
+            print(f"📋 SDP: serial port on channel {resolved}")
             try:
-                sock = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
-                sock.settimeout(5)
-                sock.connect((BT_CAR_32_MAC, channel))
-                
-                print(f"✅ SUCCESS! Connected on channel {channel}")
-                
-                # Send test command
-                sock.send(b'S\n')
-                print("📤 Sent STOP command")
-                
-                # Try to get response
-                try:
-                    sock.settimeout(2)
-                    response = sock.recv(1024).decode().strip()
-                    print(f"📥 ESP32 response: '{response}'")
-                except:
-                    print("📥 No response (normal for some ESP32s)")
-                
-                sock.close()
-                print(f"🎉 Channel {channel} is working!")
-                return True, channel
-                
+                if _probe_channel(_open_channel(bluetooth, resolved), resolved):
+                    return True, resolved
             except Exception as e:
-                print(f"❌ Channel {channel} failed: {e}")
-                continue
+                print(f"❌ Channel {resolved} failed: {e}")
+            _channel_cache.pop(BT_CAR_32_MAC, None)  # stale - look it up again next test
+            channels = [c for c in channels if c != resolved]
+        
+        # Then the usual suspects, all at once
+        print(f"📞 Trying RFCOMM channels {channels} in parallel...")
+        channel, sock = _open_first_channel(bluetooth, channels)
+        if sock is not None and _probe_channel(sock, channel):
+            return True, channel
         
         print("❌ All channels failed")
         return False, None
@@ -75,21 +148,31 @@ def unpair_and_repair():
     print("-" * 40)
     
     commands = [
-        f"echo 'remove {BT_CAR_32_MAC}' | bluetoothctl",
-        "sleep 2",
-        "echo 'power on' | bluetoothctl", 
-        "echo 'agent on' | bluetoothctl",
-        f"echo 'pair {BT_CAR_32_MAC}' | bluetoothctl",
-        f"echo 'trust {BT_CAR_32_MAC}' | bluetoothctl",
-        "echo 'quit' | bluetoothctl"
+        f"remove {BT_CAR_32_MAC}",
+        "power on",
+        "agent on",
+        f"pair {BT_CAR_32_MAC}",
+        f"trust {BT_CAR_32_MAC}"
     ]
     
+    # Feed every command to a single bluetoothctl session - one process, no per-command sleeps
     for cmd in commands:
-        print(f"🔧 {cmd}")
-        success, stdout, stderr = run_cmd(cmd)
+        print(f"🔧 bluetoothctl: {cmd}")
+    try:
+        proc = subprocess.Popen(["bluetoothctl"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True)
+        try:
+            proc.stdin.write("\n".join(commands) + "\n")
+            proc.stdin.flush()
+            time.sleep(2)  # let the pairing settle once, then quit the session
+            stdout, stderr = proc.communicate("quit\n", timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            stdout, stderr = proc.communicate()
         if "Failed" in stdout or "Failed" in stderr:
             print(f"⚠️ Command had issues")
-        time.sleep(1)
+    except OSError as e:
+        print(f"⚠️ Could not run bluetoothctl: {e}")
     
     print("✅ Pairing attempt completed")
 
@@ -107,9 +190,13 @@ def restart_bluetooth():
         "sleep 3"
     ]
     
+    # One shell runs the whole sequence, sleeps included
     for cmd in commands:
         print(f"🔧 {cmd}")
-        run_cmd(cmd)
+    try:
+        subprocess.run(["bash", "-c", "; ".join(commands)], capture_output=True, timeout=30)
+    except subprocess.TimeoutExpired:
+        print("⚠️ Bluetooth restart timed out")
     
     print("✅ Bluetooth restarted")
 
@@ -6,20 +6,31 @@
 Emergency test for robot commands
 """
 
+import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
 
 # Update with your Pi IP!
 PI_IP = "192.168.1.2"
 PI_URL = f"http://{PI_IP}:5000"
 
+# Status check and test commands share one keep-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+SESSION.headers["Connection"] = "keep-alive"
+
+# Pre-serialized /move bodies, one per command letter
+_CT = {"Content-Type": "application/json"}
+_BODY = {c: json.dumps({"direction": c}).encode("ascii") for c in "FBLRS"}
+
 def test_robot():
     print("🚀 Quick Robot Test")
     print(f"Target: {PI_URL}")
     
     # Check connection
     try:
-        response = requests.get(f"{PI_URL}/status", timeout=3)
+        response = SESSION.get(f"{PI_URL}/status", timeout=3)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Pi connected - UART: {data.get('uart_status')}")
@@ -30,17 +41,23 @@ def test_robot():
         print("❌ Cannot reach Pi")
         return
     
-    # Test commands
+    # Test commands - paced on a fixed 2 s schedule, so each POST's round trip
+    # is absorbed into the gap instead of added on top of it
     commands = ['S', 'F', 'S']
+    next_send = time.monotonic()
     for cmd in commands:
         print(f"Sending: {cmd}")
         try:
-            requests.post(f"{PI_URL}/move", json={"direction": cmd}, timeout=3)
+            SESSION.post(f"{PI_URL}/move", data=_BODY[cmd], headers=_CT, timeout=3)
         except:
             print(f"Failed: {cmd}")
-        time.sleep(2)
+        next_send += 2
+        time.sleep(max(0.0, next_send - time.monotonic()))
     
     print("Done!")
 
 if __name__ == "__main__":
-    test_robot()
\ No newline at end of file
+    try:
+        test_robot()
+    finally:
+        SESSION.close()
\ No newline at end of file
@@ -24,10 +24,19 @@ import os
 import sys
 import json
 import time
+import hashlib
+import gzip
 import threading
+import socket
 import logging
+import logging.handlers
+import queue
+import atexit
+from collections import deque
+from itertools import islice
 from datetime import datetime
-from flask import Flask, request, jsonify, Response, render_template_string
+from flask import Flask, request, Response
+from werkzeug.serving import WSGIRequestHandler
 import cv2
 
 # Try to import serial for UART communication
@@ -38,6 +47,35 @@ except ImportError:
     print("❌ PySerial not installed. Run: pip install pyserial")
     SERIAL_AVAILABLE = False
 
+# Production WSGI server if available (the Werkzeug dev server struggles with parallel streams)
+try:
+    from waitress import serve as waitress_serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    print("⚠️ waitress not installed, using Flask dev server. Run: pip install waitress")
+    WAITRESS_AVAILABLE = False
+
+# Faster JSON straight to bytes if orjson is installed
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    json_loads = json.loads
+
+def _json(obj, status=200):
+    """JSON response without going through jsonify"""
+    return Response(json_dumps(obj), status=status, mimetype='application/json')
+
+# Optional WebSocket channel (JPEG frames out, commands in, one connection)
+try:
+    from flask_sock import Sock
+    SOCK_AVAILABLE = True
+except ImportError:
+    SOCK_AVAILABLE = False
+
 # Configure logging
 def setup_logging():
     """Setup logging with fallback options"""
@@ -59,14 +97,25 @@ def setup_logging():
         except (PermissionError, FileNotFoundError, OSError):
             continue
     
+    # Request threads only enqueue records; a listener thread does the console/file I/O
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    for handler in log_handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=log_handlers
+        format='%(message)s',  # real formatting happens on the listener side
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
 
 setup_logging()
 logger = logging.getLogger(__name__)
+if os.environ.get('ROBOT_PROD') == '1':
+    logger.setLevel(logging.WARNING)  # production: skip per-command info/debug records
 
 # Enhanced web interface for robot control
 WEB_INTERFACE = """
@@ -91,6 +140,19 @@ WEB_INTERFACE = """
             background: rgba(255,255,255,0.1);
             border-radius: 15px;
             padding: 15px;
+            position: relative;
+        }
+        .stream-overlay {
+            position: absolute;
+            top: 25px;
+            left: 25px;
+            background: rgba(0,0,0,0.5);
+            color: #0ff;
+            font: 14px monospace;
+            text-align: left;
+            padding: 4px 8px;
+            border-radius: 5px;
+            pointer-events: none;
         }
         .controls { 
             margin: 20px; 
@@ -148,6 +210,7 @@ WEB_INTERFACE = """
         
         <div class="video-container">
             <img id="stream" src="/?action=stream" alt="Robot Camera Stream" onerror="handleStreamError()">
+            <div class="stream-overlay" id="stream-overlay">Last: -</div>
         </div>
         
         <div class="controls">
@@ -188,11 +251,18 @@ WEB_INTERFACE = """
     
     <script>
         let currentCommand = 'S';
+        let controlSocket = null;  // set while the /ws channel is up
         
         async function sendCommand(cmd) {
             if (cmd === currentCommand) return;
             currentCommand = cmd;
             
+            if (controlSocket && controlSocket.readyState === WebSocket.OPEN) {
+                controlSocket.send(cmd);
+                updateStatus(`Command: ${cmd} - sent`, true);
+                return;
+            }
+            
             try {
                 const response = await fetch('/move', {
                     method: 'POST',
@@ -214,11 +284,7 @@ WEB_INTERFACE = """
             statusEl.className = success ? 'status-good' : 'status-bad';
         }
         
-        async function updateRobotInfo() {
-            try {
-                const response = await fetch('/status');
-                const data = await response.json();
-                
+        function renderRobotInfo(data) {
                 document.getElementById('robot-info').innerHTML = `
                     UART: <span class="${data.uart_connected ? 'status-good' : 'status-bad'}">
                         ${data.uart_connected ? '✅ Connected' : '❌ Disconnected'}
@@ -231,13 +297,20 @@ WEB_INTERFACE = """
                         ${data.camera_active ? '✅ Active' : '❌ Inactive'}
                     </span>
                 `;
+                document.getElementById('stream-overlay').textContent =
+                    `Last: ${data.last_command}  ${data.timestamp.slice(11, 19)}`;
                 
                 if (data.uart_connected) {
                     updateStatus('🤖 Robot Online (GPIO UART)', true);
                 } else {
                     updateStatus('⚠️ Robot Offline', false);
                 }
-                
+        }
+        
+        async function updateRobotInfo() {
+            try {
+                const response = await fetch('/status');
+                renderRobotInfo(await response.json());
             } catch (error) {
                 updateStatus('❌ Connection Lost', false);
             }
@@ -247,6 +320,32 @@ WEB_INTERFACE = """
             document.getElementById('stream').src = 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNjQwIiBoZWlnaHQ9IjQ4MCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwJSIgaGVpZ2h0PSIxMDAlIiBmaWxsPSIjMzMzIi8+PHRleHQgeD0iNTAlIiB5PSI1MCUiIGZvbnQtZmFtaWx5PSJBcmlhbCIgZm9udC1zaXplPSIyMCIgZmlsbD0id2hpdGUiIHRleHQtYW5jaG9yPSJtaWRkbGUiIGR5PSIuM2VtIj5DYW1lcmEgT2ZmbGluZTwvdGV4dD48L3N2Zz4=';
         }
         
+        // Prefer one WebSocket for frames + commands; MJPEG and /move stay as fallback
+        function startWebSocket() {
+            if (!window.WebSocket) return;
+            const img = document.getElementById('stream');
+            const ws = new WebSocket(`${location.protocol === 'https:' ? 'wss' : 'ws'}://${location.host}/ws`);
+            ws.binaryType = 'arraybuffer';
+            let frameUrl = null;
+            ws.onopen = () => {
+                controlSocket = ws;
+                img.onerror = null;
+            };
+            ws.onmessage = (e) => {
+                const url = URL.createObjectURL(new Blob([e.data], { type: 'image/jpeg' }));
+                img.src = url;
+                if (frameUrl) URL.revokeObjectURL(frameUrl);
+                frameUrl = url;
+            };
+            ws.onclose = () => {
+                if (controlSocket !== ws) return;  // never opened, MJPEG is still running
+                controlSocket = null;
+                img.onerror = handleStreamError;
+                img.src = '/?action=stream';
+            };
+        }
+        startWebSocket();
+        
         // Keyboard controls
         document.addEventListener('keydown', (e) => {
             if (e.repeat) return;
@@ -266,14 +365,40 @@ WEB_INTERFACE = """
             }
         });
         
-        // Update info every 2 seconds
-        setInterval(updateRobotInfo, 2000);
-        updateRobotInfo();
+        // Server pushes status when it changes; poll every 2 seconds if SSE isn't available
+        if (window.EventSource) {
+            const statusStream = new EventSource('/status_stream');
+            statusStream.onmessage = (e) => renderRobotInfo(JSON.parse(e.data));
+            statusStream.onerror = () => updateStatus('❌ Connection Lost', false);  // browser reconnects
+        } else {
+            setInterval(updateRobotInfo, 2000);
+            updateRobotInfo();
+        }
     </script>
 </body>
 </html>
 """
 
+# The page has no template tags, so encode it once instead of running Jinja per request
+WEB_INTERFACE_BYTES = WEB_INTERFACE.encode('utf-8')
+WEB_INTERFACE_ETAG = hashlib.md5(WEB_INTERFACE_BYTES).hexdigest()
+WEB_INTERFACE_GZ = gzip.compress(WEB_INTERFACE_BYTES, 9)  # compressed once, not per request
+
+class NoDelayRequestHandler(WSGIRequestHandler):
+    """Dev-server handler with Nagle off, so small /move replies and frame headers go out at once"""
+    
+    def setup(self):
+        super().setup()
+        try:
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+
+# MJPEG part framing, built once
+MJPEG_PART_PREFIX = b'Content-Type: image/jpeg\r\nContent-Length: '
+MJPEG_PART_SUFFIX = b'\r\n\r\n'
+MJPEG_BOUNDARY = b'\r\n--frame\r\n'
+
 class GPIORobotServer:
     def __init__(self):
         self.app = Flask(__name__)
@@ -286,14 +411,60 @@ class GPIORobotServer:
         self.uart_connected = False
         self.camera_active = False
         
-        # Command history
-        self.command_history = []
+        # Wire bytes for each command, and one writer at a time on the UART
+        self._cmd_bytes = {c: c.encode() for c in "FBLRS"}  # one byte, ~1 ms on the wire at 9600
+        self._uart_lock = threading.Lock()
+        self._last_send_ts = 0.0
+        self._rx_drain_running = False
+        self.dedup_window = 0.05  # identical commands closer than this are not re-sent
+        
+        # Wall-clock strings, rebuilt at most once per second
+        self._time_str_sec = 0
+        self._time_str = ''
+        self._time_iso = ''
+        
+        # Command history - last 100, oldest dropped automatically
+        self.command_history = deque(maxlen=100)
+        
+        # Status fields that never change after startup
+        self._status_base = {
+            'server_status': 'running',
+            'uart_port': self.uart_port,
+            'uart_baud': self.uart_baud_rate,
+            'gpio_uart': True
+        }
+        
+        # Bumped whenever status changes so /status_stream can push instead of being polled
+        self._status_cond = threading.Condition()
+        self._status_version = 0
+        
+        # Latest JPEG, captured and encoded once by _capture_loop and fanned out to every viewer
+        self._frame_cond = threading.Condition()
+        self._latest_jpeg = b''
+        self._frame_counter = 0
+        self._viewers = 0
+        self._capture_running = False
+        self.debug_overlay = False   # burn status text into frames (needs decode + re-encode); the page overlays it otherwise
+        self._raw_jpeg = False       # camera hands us finished MJPEG frames
+        self.stream_min_interval = 0.0  # seconds between frames per client (0 = camera rate)
+        self.stream_size = (480, 360)  # plenty for a control UI, ~half the pixels of 640x480
+        self._jpeg_q = 85            # dropped to 60 while viewers can't keep up
+        self._frames_taken = 0       # frames handed to viewers (approximate, for _jpeg_q)
+        
+        # MJPEG and SSE responses each hold a server thread until the client leaves;
+        # waitress gets two threads on top of these so /move and /status always have one
+        self.max_streams = 6
+        self._open_streams = 0
+        self._streams_lock = threading.Lock()
         
         # Setup routes
         self.setup_routes()
         
         # Initialize camera
         self.init_camera()
+        if self.camera_active:
+            self._capture_running = True
+            threading.Thread(target=self._capture_loop, daemon=True).start()
         
         # Configure GPIO UART
         self.setup_gpio_uart()
@@ -351,7 +522,7 @@ class GPIORobotServer:
                 logger.info("✅ UART enabled in config.txt")
                 
         except Exception as e:
-            logger.warning(f"Could not check UART config: {e}")
+            logger.warning("Could not check UART config: %s", e)
     
     def setup_routes(self):
         """Setup Flask routes"""
@@ -360,112 +531,325 @@ class GPIORobotServer:
         def index():
             # Check if this is a stream request
             if request.args.get('action') == 'stream':
-                return Response(
-                    self.generate_camera_frames(),
+                return self._stream_response(
+                    self.generate_camera_frames,
                     mimetype='multipart/x-mixed-replace; boundary=frame'
                 )
             
-            # Return web interface
-            return render_template_string(WEB_INTERFACE)
+            # Return web interface, pre-gzipped for clients that accept it
+            headers = {'Cache-Control': 'public, max-age=3600', 'Vary': 'Accept-Encoding'}
+            if 'gzip' in request.headers.get('Accept-Encoding', ''):
+                headers['Content-Encoding'] = 'gzip'
+                response = Response(WEB_INTERFACE_GZ, mimetype='text/html', headers=headers)
+                response.set_etag(WEB_INTERFACE_ETAG + '-gz')
+            else:
+                response = Response(WEB_INTERFACE_BYTES, mimetype='text/html', headers=headers)
+                response.set_etag(WEB_INTERFACE_ETAG)
+            return response.make_conditional(request)
         
         @self.app.route('/move', methods=['POST'])
         def move_robot():
             """Send movement command to ESP32 via GPIO UART"""
             try:
-                data = request.get_json()
+                data = json_loads(request.get_data())
                 if not data or 'command' not in data:
-                    return jsonify({'error': 'No command provided'}), 400
+                    return _json({'error': 'No command provided'}, 400)
                 
-                command = data['command'].upper()
-                if command not in ['F', 'B', 'L', 'R', 'S']:
-                    return jsonify({'error': 'Invalid command'}), 400
-                
-                # Log command
-                timestamp = datetime.now().isoformat()
-                self.command_history.append({
-                    'command': command,
-                    'timestamp': timestamp,
-                    'source': request.remote_addr
-                })
-                
-                # Keep only last 100 commands
-                if len(self.command_history) > 100:
-                    self.command_history = self.command_history[-100:]
-                
-                # Send to ESP32 via GPIO UART
-                success = self.send_to_esp32_uart(command)
-                
-                if success:
-                    self.last_command = command
-                    self.command_count += 1
-                    return jsonify({
-                        'status': 'success',
-                        'command': command,
-                        'timestamp': timestamp,
-                        'method': 'GPIO UART',
-                        'baud': self.uart_baud_rate
-                    })
-                else:
-                    return jsonify({
-                        'status': 'error',
-                        'message': 'UART communication failed'
-                    }), 500
+                result, code = self.execute_command(data['command'], request.remote_addr)
+                return _json(result, code)
                     
             except Exception as e:
-                logger.error(f"Move command error: {e}")
-                return jsonify({'error': str(e)}), 500
+                logger.error("Move command error: %s", e)
+                return _json({'error': str(e)}, 500)
+        
+        if SOCK_AVAILABLE:
+            sock = Sock(self.app)
+            
+            @sock.route('/ws')
+            def ws_channel(ws):
+                """Binary JPEG frames to the client, single-letter commands from it"""
+                self.serve_websocket(ws, request.remote_addr)
         
         @self.app.route('/status', methods=['GET'])
         def get_status():
             """Get server status"""
-            return jsonify({
-                'server_status': 'running',
-                'uart_connected': self.uart_connected,
-                'uart_port': self.uart_port,
-                'uart_baud': self.uart_baud_rate,
-                'camera_active': self.camera_active,
-                'last_command': self.last_command,
-                'command_count': self.command_count,
-                'recent_commands': self.command_history[-5:],
-                'gpio_uart': True,
-                'timestamp': datetime.now().isoformat()
-            })
+            return _json(self.status_snapshot())
+        
+        @self.app.route('/status_stream', methods=['GET'])
+        def status_stream():
+            """Push status over one Server-Sent Events connection (/status stays for polling)"""
+            return self._stream_response(self.generate_status_events, mimetype='text/event-stream',
+                                         headers={'Cache-Control': 'no-cache'})
+    
+    def _stream_response(self, generator, **kwargs):
+        """Long-lived response from generator(), or 503 once max_streams are already open"""
+        with self._streams_lock:
+            if self._open_streams >= self.max_streams:
+                return _json({'error': 'Too many open streams'}, 503)
+            self._open_streams += 1
+        response = Response(generator(), **kwargs)
+        # Runs when the WSGI server closes the response, even if the generator never started
+        response.call_on_close(self._stream_closed)
+        return response
+    
+    def _stream_closed(self):
+        with self._streams_lock:
+            self._open_streams -= 1
+    
+    def execute_command(self, command, source):
+        """Validate, de-duplicate, log and send one command; returns (response dict, HTTP code)"""
+        command = command.upper()
+        if command not in ['F', 'B', 'L', 'R', 'S']:
+            return {'error': 'Invalid command'}, 400
+        
+        # Key auto-repeat / several clients: the ESP32 already has this command
+        if command == self.last_command and time.monotonic() - self._last_send_ts < self.dedup_window:
+            return {'status': 'success', 'command': command, 'deduped': True}, 200
+        
+        # Log command (raw epoch seconds; formatted only when /status is read)
+        self.command_history.append({
+            'command': command,
+            'timestamp': time.time(),
+            'source': source
+        })
+        
+        # Send to ESP32 via GPIO UART
+        if self.send_to_esp32_uart(command):
+            self.last_command = command
+            self._last_send_ts = time.monotonic()
+            self.command_count += 1
+            self._status_changed()
+            return {
+                'status': 'success',
+                'command': command,
+                'timestamp': self._now_iso(),
+                'method': 'GPIO UART',
+                'baud': self.uart_baud_rate
+            }, 200
+        return {
+            'status': 'error',
+            'message': 'UART communication failed'
+        }, 500
+    
+    def serve_websocket(self, ws, source):
+        """Run one /ws client: a sender thread pushes frames, this thread reads commands"""
+        closed = threading.Event()
+        
+        def push_frames():
+            try:
+                for jpeg in self.iter_jpeg_frames(closed):
+                    ws.send(jpeg)
+            except Exception:
+                pass  # client went away
+            finally:
+                closed.set()
+        
+        threading.Thread(target=push_frames, daemon=True).start()
+        try:
+            while not closed.is_set():
+                message = ws.receive(timeout=1.0)
+                if message:
+                    result, _ = self.execute_command(str(message).strip(), source)
+                    if result.get('status') != 'success':
+                        logger.warning("WebSocket command rejected: %r %s", message, result)
+        finally:
+            closed.set()
+    
+    def status_snapshot(self):
+        """Current server status as a JSON-able dict"""
+        history = self.command_history
+        status = self._status_base.copy()
+        status.update(
+            uart_connected=self.uart_connected,
+            camera_active=self.camera_active,
+            last_command=self.last_command,
+            command_count=self.command_count,
+            recent_commands=[
+                dict(entry, timestamp=datetime.fromtimestamp(entry['timestamp']).isoformat())
+                for entry in islice(history, max(len(history) - 5, 0), None)
+            ],
+            timestamp=self._now_iso()
+        )
+        return status
+    
+    def _tick_clock(self):
+        """Refresh the cached time strings when the second changes"""
+        t = int(time.time())
+        if t != self._time_str_sec:
+            now = datetime.fromtimestamp(t)
+            self._time_str = now.strftime("%H:%M:%S")
+            self._time_iso = now.isoformat()
+            self._time_str_sec = t
+    
+    def _now_str(self):
+        """HH:MM:SS, second resolution"""
+        self._tick_clock()
+        return self._time_str
+    
+    def _now_iso(self):
+        """ISO-8601 local time, second resolution"""
+        self._tick_clock()
+        return self._time_iso
+    
+    def _status_changed(self):
+        """Wake /status_stream clients"""
+        with self._status_cond:
+            self._status_version += 1
+            self._status_cond.notify_all()
+    
+    def generate_status_events(self):
+        """SSE generator: send a snapshot when status changes, a comment line as keepalive"""
+        last_version = -1
+        last_state = None
+        idle = 0.0
+        while True:
+            with self._status_cond:
+                self._status_cond.wait_for(lambda: self._status_version != last_version, timeout=2.0)
+                last_version = self._status_version
+            
+            snapshot = self.status_snapshot()
+            # Re-check every 2 s too, so changes made without _status_changed() still go out
+            state = {k: v for k, v in snapshot.items() if k != 'timestamp'}
+            if state != last_state:
+                last_state = state
+                idle = 0.0
+                yield b"data: " + json_dumps(snapshot) + b"\n\n"
+            else:
+                idle += 2.0
+                if idle >= 15.0:
+                    idle = 0.0
+                    yield b": keepalive\n\n"
     
     def init_camera(self):
         """Initialize camera"""
         try:
-            self.camera = cv2.VideoCapture(0)
+            # V4L2 + MJPG: the camera/ISP compresses frames, not our CPU
+            self.camera = cv2.VideoCapture(0, cv2.CAP_V4L2)
+            if not self.camera.isOpened():
+                self.camera = cv2.VideoCapture(0)
             if self.camera.isOpened():
-                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+                self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+                # Ask the sensor for the stream size so smaller buffers come off V4L2;
+                # drivers snap to the nearest mode they support
+                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.stream_size[0])
+                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.stream_size[1])
                 self.camera.set(cv2.CAP_PROP_FPS, 30)
                 self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                if not self.debug_overlay:
+                    self._raw_jpeg = self._enable_raw_jpeg()
                 self.camera_active = True
-                logger.info("✅ Camera initialized")
+                logger.info(f"✅ Camera initialized ({'hardware MJPEG passthrough' if self._raw_jpeg else 'CPU JPEG encode'})")
             else:
                 logger.warning("❌ Camera not available")
         except Exception as e:
             logger.error(f"Camera error: {e}")
     
-    def generate_camera_frames(self):
-        """Generate camera frames for streaming"""
-        while True:
-            if self.camera and self.camera.isOpened():
-                ret, frame = self.camera.read()
-                if ret:
-                    # Add status overlay
+    def _enable_raw_jpeg(self):
+        """Ask OpenCV for the undecoded MJPEG buffers; True if frames really arrive as JPEG"""
+        self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        ret, buf = self.camera.read()
+        if ret and buf is not None and buf.size > 2 and buf.dtype == 'uint8':
+            head = buf.reshape(-1)[:2]
+            if head[0] == 0xFF and head[1] == 0xD8:  # JPEG SOI marker
+                return True
+        self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+        return False
+    
+    def _capture_loop(self):
+        """Single producer: read, overlay and encode each frame once for all viewers"""
+        window_start = time.monotonic()
+        window_produced = 0
+        while self._capture_running and self.camera and self.camera.isOpened():
+            # grab() always, so the capture buffer stays fresh even with nobody watching;
+            # decoding/encoding only happens for viewers
+            if not self.camera.grab():
+                time.sleep(0.033)
+                continue
+            if not self._viewers:
+                continue
+            ret, frame = self.camera.retrieve()
+            if not ret:
+                continue
+            
+            if self._raw_jpeg:
+                jpeg = frame.tobytes()  # already compressed by the camera
+            else:
+                # Camera couldn't do stream_size natively - shrink once before encoding
+                if frame.shape[1] > self.stream_size[0]:
+                    frame = cv2.resize(frame, self.stream_size, interpolation=cv2.INTER_LINEAR)
+                
+                # Status text is drawn by the page; only burn it in when debugging
+                if self.debug_overlay:
                     self.add_status_overlay(frame)
-                    
-                    # Encode frame
-                    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                    frame_bytes = buffer.tobytes()
-                    
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            time.sleep(0.033)  # ~30 FPS
+                
+                # Encode frame (no optimize pass, it roughly doubles encode time)
+                ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self._jpeg_q,
+                                                          cv2.IMWRITE_JPEG_OPTIMIZE, 0])
+                if not ok:
+                    continue
+                jpeg = buffer.tobytes()
+                
+                # Once a second: if viewers take under half of what we encode, the link is
+                # the bottleneck - smaller frames encode faster and send faster
+                window_produced += 1
+                now = time.monotonic()
+                if now - window_start >= 1.0:
+                    taken_per_viewer = self._frames_taken / max(self._viewers, 1)
+                    self._jpeg_q = 60 if window_produced > 2 * taken_per_viewer else 85
+                    self._frames_taken = 0
+                    window_produced = 0
+                    window_start = now
+            with self._frame_cond:
+                self._latest_jpeg = jpeg
+                self._frame_counter += 1
+                self._frame_cond.notify_all()
+    
+    def iter_jpeg_frames(self, stop=None):
+        """Yield each new shared JPEG once; slow consumers skip to the newest frame"""
+        with self._frame_cond:
+            self._viewers += 1
+        try:
+            last_seen = -1
+            last_yield = 0.0
+            while stop is None or not stop.is_set():
+                # Everyone shares the same immutable bytes; a slow client just skips
+                # to whatever is newest when it gets back here
+                with self._frame_cond:
+                    if not self._frame_cond.wait_for(
+                            lambda: self._frame_counter > last_seen and self._latest_jpeg, timeout=1.0):
+                        continue
+                    frame_bytes = self._latest_jpeg
+                    last_seen = self._frame_counter
+                
+                # Optional cap for slow links: drop frames rather than sleeping
+                if self.stream_min_interval:
+                    now = time.monotonic()
+                    if now - last_yield < self.stream_min_interval:
+                        continue
+                    last_yield = now
+                
+                self._frames_taken += 1
+                yield frame_bytes
+        finally:
+            with self._frame_cond:
+                self._viewers -= 1
+                if not self._viewers:
+                    self._latest_jpeg = b''  # don't greet the next viewer with a stale frame
+    
+    def generate_camera_frames(self):
+        """Generate camera frames for streaming (multipart MJPEG around iter_jpeg_frames)"""
+        # Boundary goes *after* each part so the browser shows a frame as soon as it
+        # arrives instead of waiting for the next one's boundary
+        yield b'--frame\r\n'
+        for frame_bytes in self.iter_jpeg_frames():
+            # Separate yields: the shared JPEG goes out as-is instead of being copied
+            # into a new header+payload bytes object per client per frame
+            yield MJPEG_PART_PREFIX + str(len(frame_bytes)).encode() + MJPEG_PART_SUFFIX
+            yield frame_bytes
+            yield MJPEG_BOUNDARY
     
     def add_status_overlay(self, frame):
-        """Add status overlay to video"""
+        """Add status overlay to video (debug only, the web page shows the same info)"""
         # UART connection status
         status_color = (0, 255, 0) if self.uart_connected else (0, 0, 255)
         status_text = f"GPIO UART: {'Connected' if self.uart_connected else 'Disconnected'}"
@@ -478,8 +862,7 @@ class GPIORobotServer:
         cv2.putText(frame, f"Last: {self.last_command}", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
         
         # Timestamp
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        cv2.putText(frame, timestamp, (500, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        cv2.putText(frame, self._now_str(), (frame.shape[1] - 140, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
     
     def connect_uart(self):
         """Connect to ESP32 via GPIO UART"""
@@ -491,7 +874,7 @@ class GPIORobotServer:
             if self.uart_connection and self.uart_connection.is_open:
                 self.uart_connection.close()
             
-            logger.info(f"🔗 Connecting to {self.uart_port} at {self.uart_baud_rate} baud")
+            logger.info("🔗 Connecting to %s at %s baud", self.uart_port, self.uart_baud_rate)
             
             self.uart_connection = serial.Serial(
                 port=self.uart_port,
@@ -507,17 +890,23 @@ class GPIORobotServer:
             
             if self.uart_connection.is_open:
                 self.uart_connected = True
-                logger.info(f"✅ GPIO UART connected at {self.uart_baud_rate} baud")
+                self._status_changed()
+                logger.info("✅ GPIO UART connected at %s baud", self.uart_baud_rate)
+                
+                # Nothing reads the ESP32's replies; keep its RX buffer from overrunning
+                if not self._rx_drain_running:
+                    self._rx_drain_running = True
+                    threading.Thread(target=self._rx_drain_loop, daemon=True).start()
                 
                 # Send test command
-                self.uart_connection.write(b'S\n')
+                self.uart_connection.write(self._cmd_bytes['S'])
                 self.uart_connection.flush()
                 
                 return True
             return False
             
         except Exception as e:
-            logger.error(f"❌ GPIO UART connection failed: {e}")
+            logger.error("❌ GPIO UART connection failed: %s", e)
             if "Permission denied" in str(e):
                 logger.error("💡 Add user to dialout group: sudo usermod -a -G dialout $USER")
             elif "No such file" in str(e):
@@ -526,35 +915,49 @@ class GPIORobotServer:
             self.uart_connected = False
             return False
     
+    def _rx_drain_loop(self):
+        """Read and discard whatever the ESP32 sends back (commands are fire-and-forget)"""
+        while self._rx_drain_running:
+            conn = self.uart_connection
+            try:
+                if conn and conn.is_open and conn.in_waiting:
+                    discarded = conn.read(conn.in_waiting)
+                    logger.debug("📥 Discarded %d UART RX bytes", len(discarded))
+            except Exception:
+                pass  # port closed/reopened under us; next pass picks up the new one
+            time.sleep(0.5)
+    
     def send_to_esp32_uart(self, command):
         """Send command to ESP32 via GPIO UART"""
-        if not self.uart_connected or not self.uart_connection:
-            # Try to reconnect
-            if not self.connect_uart():
-                return False
-        
-        try:
-            # Send single character command (matching ESP32 code)
-            message = f"{command}\n"
-            self.uart_connection.write(message.encode('utf-8'))
-            self.uart_connection.flush()
+        with self._uart_lock:
+            if not self.uart_connected or not self.uart_connection:
+                # Try to reconnect
+                if not self.connect_uart():
+                    return False
             
-            logger.info(f"📤 Sent via GPIO UART: {command}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"UART send failed: {e}")
-            self.uart_connected = False
-            return False
+            try:
+                # Send single character command (matching ESP32 code) - no flush(), the
+                # byte goes straight to the driver and the kernel drains it
+                self.uart_connection.write(self._cmd_bytes[command])
+                
+                logger.debug("📤 Sent via GPIO UART: %s", command)
+                return True
+                
+            except Exception as e:
+                logger.error("UART send failed: %s", e)
+                self.uart_connected = False
+                return False
     
     def cleanup(self):
         """Cleanup resources"""
         if self.uart_connection and self.uart_connection.is_open:
             try:
-                self.uart_connection.write(b'S\n')  # Stop robot
+                self.uart_connection.write(self._cmd_bytes['S'])  # Stop robot
                 self.uart_connection.close()
             except:
                 pass
+        self._capture_running = False
+        self._rx_drain_running = False
         if self.camera:
             self.camera.release()
         logger.info("Server cleanup completed")
@@ -573,8 +976,15 @@ class GPIORobotServer:
             logger.info("   Network: Check your Pi's IP address")
             logger.info("   GPIO UART: TX=Pin8, RX=Pin10, 9600 baud")
             
-            # Start Flask server
-            self.app.run(host=host, port=port, debug=False, threaded=True)
+            # Start web server - every MJPEG/SSE client holds a thread, so leave room for /move
+            if WAITRESS_AVAILABLE:
+                threads = self.max_streams + 2
+                logger.info("   WSGI: waitress, %d threads (%d for streams)", threads, self.max_streams)
+                # waitress sets TCP_NODELAY on its sockets by default (socket_options)
+                waitress_serve(self.app, host=host, port=port, threads=threads, channel_timeout=30)
+            else:
+                self.app.run(host=host, port=port, debug=False, threaded=True,
+                             request_handler=NoDelayRequestHandler)
             
         except Exception as e:
             logger.error(f"Server error: {e}")
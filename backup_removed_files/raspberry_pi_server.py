@@ -19,13 +19,33 @@ import sys
 import json
 import time
 import threading
+import queue
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from datetime import datetime
 from flask import Flask, request, jsonify, Response
 import cv2
+import numpy as np
 import serial
 import serial.tools.list_ports
 
+# libjpeg-turbo (NEON on the Pi) if PyTurboJPEG is installed; cv2.imencode otherwise
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# waitress does socket I/O on its own event loop and only hands app code to worker
+# threads; fall back to the Werkzeug dev server without it
+try:
+    from waitress import serve as waitress_serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
 # Configure logging
 def setup_logging():
     """Setup logging with fallback options"""
@@ -58,6 +78,9 @@ def setup_logging():
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Stream sizes a client can ask for with ?profile= (or ?w=, nearest width wins)
+STREAM_PROFILES = {'low': (320, 240), 'med': (480, 360), 'high': (640, 480)}
+
 class RobotCommandServer:
     def __init__(self):
         self.app = Flask(__name__)
@@ -69,15 +92,46 @@ class RobotCommandServer:
         self.command_count = 0
         self.esp32_connected = False
         self.camera_active = False
+        self.stream_fps = 30
+        self._buffer_depth = 1  # frames the capture backend can queue
+        
+        # One capture thread encodes each frame once; stream clients share the bytes
+        self._frame_cond = threading.Condition()
+        self._latest_parts = {}  # profile -> complete multipart chunk: boundary, headers, JPEG
+        self._profile_viewers = dict.fromkeys(STREAM_PROFILES, 0)
+        self._resize_bufs = {}  # profile -> reused resize target
+        self._frame_counter = 0
+        self._capture_running = False
+        self._frame_buf = None  # reused by retrieve() for every captured frame
+        
+        # Each MJPEG viewer holds a server thread until it disconnects; waitress
+        # gets two threads on top of these so /move always has one
+        self.max_streams = 6
+        self._open_streams = 0
+        self._streams_lock = threading.Lock()
+        self._overlay_key = None  # state the cached overlay was drawn for
+        self._overlay = None      # (text band, mask) from _render_overlay
+        self._tj = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self._tj = TurboJPEG()
+            except Exception as e:  # Python wrapper present but libturbojpeg missing
+                logger.warning(f"TurboJPEG unavailable, using cv2.imencode: {e}")
+        
+        # Only the writer thread touches the UART; /move threads just enqueue
+        self._tx_q = queue.Queue(maxsize=4)
+        self._tx_put_lock = threading.Lock()
+        self._last_enqueued = None
+        threading.Thread(target=self._uart_writer, daemon=True).start()
         
-        # Command history for debugging
-        self.command_history = []
+        # Command history for debugging - last 100, oldest dropped automatically
+        self.command_history = deque(maxlen=100)
         
         # Setup routes
         self.setup_routes()
         
-        # Initialize camera
-        self.init_camera()
+        # Camera is opened by the first stream request (see _ensure_camera)
+        self._camera_lock = threading.Lock()
         
         logger.info("Robot Command Server initialized (UART mode)")
     
@@ -88,10 +142,7 @@ class RobotCommandServer:
         def index():
             # Check if this is a camera stream request
             if request.args.get('action') == 'stream':
-                return Response(
-                    self.generate_camera_frames(),
-                    mimetype='multipart/x-mixed-replace; boundary=frame'
-                )
+                return self._camera_stream_response()
             
             # Otherwise return status
             return jsonify({
@@ -124,10 +175,6 @@ class RobotCommandServer:
                     'source': request.remote_addr
                 })
                 
-                # Keep only last 100 commands
-                if len(self.command_history) > 100:
-                    self.command_history = self.command_history[-100:]
-                
                 # Send to ESP32
                 success = self.send_to_esp32(command)
                 
@@ -164,7 +211,8 @@ class RobotCommandServer:
                 'camera_active': self.camera_active,
                 'last_command': self.last_command,
                 'command_count': self.command_count,
-                'recent_commands': self.command_history[-10:],  # Last 10 commands
+                'recent_commands': list(islice(self.command_history,  # Last 10 commands
+                                               max(len(self.command_history) - 10, 0), None)),
                 'timestamp': datetime.now().isoformat()
             })
         
@@ -225,11 +273,41 @@ class RobotCommandServer:
         
         @self.app.route('/camera_stream')
         def camera_stream():
-            """Serve camera stream"""
-            return Response(
-                self.generate_camera_frames(),
+            """Serve camera stream (?profile=low|med|high or ?w=320)"""
+            return self._camera_stream_response()
+    
+    def _camera_stream_response(self):
+        """MJPEG response for the current request, or 503 once max_streams viewers are open"""
+        with self._streams_lock:
+            if self._open_streams >= self.max_streams:
+                return jsonify({'error': 'Too many open streams'}), 503
+            self._open_streams += 1
+        try:
+            self._ensure_camera()
+            response = Response(
+                self.generate_camera_frames(self._stream_profile(request.args)),
                 mimetype='multipart/x-mixed-replace; boundary=frame'
             )
+        except Exception:
+            self._stream_closed()
+            raise
+        # Runs when the WSGI server closes the response, even if the generator never started
+        response.call_on_close(self._stream_closed)
+        return response
+    
+    def _stream_closed(self):
+        with self._streams_lock:
+            self._open_streams -= 1
+    
+    def _ensure_camera(self):
+        """Open the camera on first use, so startup doesn't wait on V4L2 and idle servers hold no buffers"""
+        if self.camera_active:
+            return
+        with self._camera_lock:
+            if not self.camera_active:
+                if self.camera:
+                    self.camera.release()
+                self.init_camera()
     
     def init_camera(self):
         """Initialize camera for streaming"""
@@ -239,9 +317,16 @@ class RobotCommandServer:
                 # Set camera properties
                 self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
                 self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                self.camera.set(cv2.CAP_PROP_FPS, 30)
-                self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimal latency
+                self.camera.set(cv2.CAP_PROP_FPS, self.stream_fps)
+                # A little slack so a stall doesn't drop frames; _grab_latest() drains it
+                self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 3)
+                self._buffer_depth = max(int(self.camera.get(cv2.CAP_PROP_BUFFERSIZE)), 1)
+                width = int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640
+                height = int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480
+                self._frame_buf = np.empty((height, width, 3), dtype=np.uint8)
                 self.camera_active = True
+                self._capture_running = True
+                threading.Thread(target=self._capture_loop, daemon=True).start()
                 logger.info("Camera initialized successfully")
             else:
                 logger.error("Failed to open camera")
@@ -250,40 +335,133 @@ class RobotCommandServer:
             logger.error(f"Camera initialization error: {e}")
             self.camera_active = False
     
-    def generate_camera_frames(self):
-        """Generate camera frames for streaming"""
-        while True:
-            if self.camera and self.camera.isOpened():
-                ret, frame = self.camera.read()
+    def _grab_latest(self):
+        """Skip frames queued in the capture buffer so retrieve() decodes the newest one"""
+        for _ in range(self._buffer_depth):
+            started = time.monotonic()
+            if not self.camera.grab():
+                return False
+            if time.monotonic() - started > 0.005:
+                break  # had to wait for the sensor, so this frame is fresh
+        return True
+    
+    def _capture_loop(self):
+        """Producer: capture, overlay and encode once per frame for every viewer"""
+        frame_interval = 1.0 / self.stream_fps
+        next_deadline = time.monotonic()
+        while self._capture_running and self.camera and self.camera.isOpened():
+            next_deadline += frame_interval
+            wanted = [p for p, viewers in self._profile_viewers.items() if viewers]
+            if self._grab_latest() and wanted:
+                # Decode into the same buffer every time instead of a fresh ~900 KB array
+                ret, frame = self.camera.retrieve(self._frame_buf)
                 if ret:
                     # Add status overlay
                     self.add_status_overlay(frame)
                     
-                    # Encode frame
-                    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
-                    frame_bytes = buffer.tobytes()
-                    
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            time.sleep(0.033)  # ~30 FPS
+                    # Encode once per size someone is watching
+                    parts = {}
+                    for profile in wanted:
+                        jpeg = self._encode_jpeg(self._scaled(frame, profile))
+                        if jpeg:
+                            # Frame it here, once, so every viewer yields the same object as-is
+                            parts[profile] = b''.join((
+                                b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n' % len(jpeg),
+                                jpeg,
+                                b'\r\n'
+                            ))
+                    with self._frame_cond:
+                        self._latest_parts = parts
+                        self._frame_counter += 1
+                        self._frame_cond.notify_all()
+            
+            # Sleep only what's left of this frame's slot (encode time already counts)
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_deadline = time.monotonic()  # fell behind - don't burst to catch up
+    
+    def _encode_jpeg(self, frame):
+        """BGR frame -> JPEG bytes (quality 70), via libjpeg-turbo when available"""
+        if self._tj is not None:
+            return self._tj.encode(np.ascontiguousarray(frame), quality=70,
+                                   pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
+        return buffer.tobytes() if ok else b''
+    
+    def _scaled(self, frame, profile):
+        """Frame at the profile's size, resized into a reused buffer (as-is if already that small)"""
+        width, height = STREAM_PROFILES[profile]
+        if frame.shape[1] <= width:
+            return frame
+        buf = self._resize_bufs.get(profile)
+        if buf is None:
+            buf = self._resize_bufs[profile] = np.empty((height, width, 3), dtype=np.uint8)
+        cv2.resize(frame, (width, height), dst=buf, interpolation=cv2.INTER_AREA)
+        return buf
+    
+    def _stream_profile(self, args):
+        """STREAM_PROFILES key from ?profile=, else the one nearest ?w=, else 'high'"""
+        name = args.get('profile')
+        if name in STREAM_PROFILES:
+            return name
+        width = args.get('w', type=int)
+        if width:
+            return min(STREAM_PROFILES, key=lambda p: abs(STREAM_PROFILES[p][0] - width))
+        return 'high'
+    
+    def generate_camera_frames(self, profile='high'):
+        """Generate camera frames for streaming (shared slot; a slow client skips frames)"""
+        with self._frame_cond:
+            self._profile_viewers[profile] += 1
+        try:
+            last_seen = 0
+            while True:
+                with self._frame_cond:
+                    if not self._frame_cond.wait_for(lambda: self._frame_counter != last_seen, timeout=1.0):
+                        continue
+                    part = self._latest_parts.get(profile)
+                    last_seen = self._frame_counter
+                
+                if part:
+                    yield part
+        finally:
+            with self._frame_cond:
+                self._profile_viewers[profile] -= 1
     
     def add_status_overlay(self, frame):
         """Add status information to camera frame"""
+        # Text only changes with state or once a second - rasterize it then, blit otherwise
+        key = (self.esp32_connected, self.last_command, self.command_count, int(time.time()), frame.shape[1])
+        if key != self._overlay_key:
+            self._overlay = self._render_overlay(frame.shape[1])
+            self._overlay_key = key
+        band, mask = self._overlay
+        np.copyto(frame[:band.shape[0]], band, where=mask)
+    
+    def _render_overlay(self, width):
+        """Draw the overlay text on a black band; returns (band, mask of text pixels)"""
+        band = np.zeros((100, width, 3), dtype=np.uint8)
+        
         # Connection status
         status_color = (0, 255, 0) if self.esp32_connected else (0, 0, 255)
         status_text = f"ESP32: {'Connected' if self.esp32_connected else 'Disconnected'}"
-        cv2.putText(frame, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
+        cv2.putText(band, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
         
         # Last command
         cmd_color = (0, 255, 255)
-        cv2.putText(frame, f"Last: {self.last_command}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, cmd_color, 2)
+        cv2.putText(band, f"Last: {self.last_command}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, cmd_color, 2)
         
         # Command count
-        cv2.putText(frame, f"Count: {self.command_count}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, cmd_color, 2)
+        cv2.putText(band, f"Count: {self.command_count}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, cmd_color, 2)
         
         # Timestamp
         timestamp = datetime.now().strftime("%H:%M:%S")
-        cv2.putText(frame, timestamp, (500, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        cv2.putText(band, timestamp, (500, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        
+        # putText isn't anti-aliased by default, so any non-black pixel is text
+        return band, band.any(axis=2, keepdims=True)
     
     def connect_serial(self, port=None, baud_rate=None):
         """Connect to ESP32 via UART serial connection"""
@@ -336,6 +514,9 @@ class RobotCommandServer:
                 except Exception as e:
                     logger.warning(f"⚠️ Test command failed (might be normal): {e}")
                 
+                # Command path only peeks for an optional ACK - don't let reads block it
+                self.serial_connection.timeout = 0.02
+                
                 return True
             else:
                 logger.error("❌ Serial port failed to open")
@@ -361,35 +542,51 @@ class RobotCommandServer:
             return False
     
     def send_to_esp32(self, command):
-        """Send command to ESP32 via UART serial"""
+        """Queue command for the UART writer thread (returns False if ESP32 isn't connected)"""
         if not self.esp32_connected or not self.serial_connection or not self.serial_connection.is_open:
             logger.warning("ESP32 not connected via serial")
             return False
         
-        try:
-            # Send single character command (matching your ESP32 code)
-            message = f"{command}\n"
-            self.serial_connection.write(message.encode('utf-8'))
-            self.serial_connection.flush()  # Ensure data is sent immediately
-            
-            logger.debug(f"Sent to ESP32 via serial: {command}")
-            
-            # Try to read any response
-            time.sleep(0.1)  # Small delay for ESP32 to respond
-            if self.serial_connection.in_waiting > 0:
-                response = self.serial_connection.read_all().decode().strip()
-                logger.debug(f"ESP32 serial response: {response}")
-            
-            return True
+        with self._tx_put_lock:
+            # A repeated STOP changes nothing on the robot
+            if command == 'S' and self._last_enqueued == 'S':
+                return True
+            try:
+                self._tx_q.put_nowait(command)
+            except queue.Full:
+                # ESP32 stalled: drop the oldest, the newest command is what matters
+                self._tx_q.get_nowait()
+                self._tx_q.put_nowait(command)
+            self._last_enqueued = command
+        return True
+    
+    def _uart_writer(self):
+        """Single consumer: write queued commands to the ESP32 one at a time"""
+        while True:
+            command = self._tx_q.get()
+            conn = self.serial_connection
+            if not conn or not conn.is_open:
+                continue
             
-        except serial.SerialException as e:
-            logger.error(f"Serial communication error: {e}")
-            self.esp32_connected = False
-            return False
-        except Exception as e:
-            logger.error(f"Failed to send command to ESP32: {e}")
-            self.esp32_connected = False
-            return False
+            try:
+                # Send single character command (matching your ESP32 code)
+                conn.write(f"{command}\n".encode('utf-8'))
+                conn.flush()  # Ensure data is sent immediately
+                
+                logger.debug(f"Sent to ESP32 via serial: {command}")
+                
+                # Optional ACK line - read_until returns as soon as it arrives, or
+                # empty after the 20 ms port timeout
+                response = conn.read_until(b'\n')
+                if response:
+                    logger.debug(f"ESP32 serial response: {response.decode(errors='replace').strip()}")
+                
+            except serial.SerialException as e:
+                logger.error(f"Serial communication error: {e}")
+                self.esp32_connected = False
+            except Exception as e:
+                logger.error(f"Failed to send command to ESP32: {e}")
+                self.esp32_connected = False
     
     def auto_discover_esp32(self):
         """Automatically discover and connect to ESP32 via serial ports"""
@@ -424,14 +621,28 @@ class RobotCommandServer:
                     if port.device not in esp32_ports:
                         esp32_ports.insert(0, port.device)
             
-            # Try connecting to each port
-            for port in esp32_ports:
-                if any(p.device == port for p in available_ports):
-                    logger.info(f"� Trying port: {port}")
-                    if self.connect_serial(port):
-                        logger.info(f"🎉 Successfully connected to ESP32 on {port}!")
-                        return True
-                    time.sleep(1)  # Brief pause between attempts
+            # Probe every candidate at once; ports that answered get the full (slow)
+            # connect first, then ports that merely opened (firmware that never replies).
+            # Within each group keep esp32_ports priority - detected USB adapters first
+            candidates = [port for port in esp32_ports if any(p.device == port for p in available_ports)]
+            replied, opened = [], []
+            if candidates:
+                with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+                    futures = {pool.submit(self._probe, port): port for port in candidates}
+                    for future in as_completed(futures):
+                        port_opened, port_replied = future.result()
+                        if port_replied:
+                            replied.append(futures[future])
+                        elif port_opened:
+                            opened.append(futures[future])
+            replied.sort(key=candidates.index)
+            opened.sort(key=candidates.index)
+            
+            for port in replied + opened:
+                logger.info(f"🔌 Trying port: {port}{' (answered probe)' if port in replied else ''}")
+                if self.connect_serial(port):
+                    logger.info(f"🎉 Successfully connected to ESP32 on {port}!")
+                    return True
             
             logger.warning("❌ Could not connect to ESP32 on any serial port")
             logger.info("💡 Check ESP32 connection and drivers")
@@ -441,6 +652,20 @@ class RobotCommandServer:
             logger.error(f"Auto-discovery failed: {e}")
             return False
     
+    def _probe(self, port):
+        """Quick ESP32 check: returns (opened, replied).
+
+        Short timeouts and no 2 s settle - that wait is for the DTR-triggered ESP32
+        reset and only matters for the real connect_serial afterwards.
+        """
+        try:
+            with serial.Serial(port, self.esp32_baud_rate, timeout=0.2, write_timeout=0.2,
+                               exclusive=True) as probe:
+                probe.write(b'S\n')
+                return True, bool(probe.read_until(b'\n'))
+        except (serial.SerialException, OSError, ValueError):
+            return False, False
+    
     def test_esp32_connection(self):
         """Test direct serial connection to ESP32"""
         try:
@@ -480,6 +705,7 @@ class RobotCommandServer:
                 self.serial_connection.close()
             except:
                 pass
+        self._capture_running = False
         if self.camera:
             self.camera.release()
         logger.info("Server cleanup completed")
@@ -492,8 +718,12 @@ class RobotCommandServer:
             # Try to auto-discover ESP32
             threading.Thread(target=self.auto_discover_esp32, daemon=True).start()
             
-            # Start Flask server
-            self.app.run(host=host, port=port, debug=False, threaded=True)
+            # Start web server - each MJPEG viewer holds one worker, the rest serve /move
+            if WAITRESS_AVAILABLE:
+                waitress_serve(self.app, host=host, port=port, threads=self.max_streams + 2,
+                               channel_timeout=30)
+            else:
+                self.app.run(host=host, port=port, debug=False, threaded=True)
             
         except KeyboardInterrupt:
             logger.info("Server shutdown requested")
@@ -1,29 +1,126 @@
 import os
 import requests
+import shutil
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+PARALLEL_PARTS = 4            # concurrent Range requests for large files
+PARALLEL_MIN_SIZE = 4 << 20   # below this one connection is already fast enough
+PROGRESS_STEP = 4 << 20       # print progress every 4 MiB, not every chunk
+
+# One session for every request; pool sized so the range workers each keep a connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=PARALLEL_PARTS))
+SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=PARALLEL_PARTS))
+
+
+class _RangeNotSupported(Exception):
+    """Server answered a Range request with the whole file."""
+
+
+class _CountingWriter:
+    """File wrapper for shutil.copyfileobj that reports each write's size."""
+
+    def __init__(self, f, on_write):
+        self._f = f
+        self._on_write = on_write
+
+    def write(self, data):
+        n = self._f.write(data)
+        self._on_write(len(data))
+        return n
+
+
+def _download_ranges(url, dest_path, total, chunk_size):
+    """Fetch `total` bytes as PARALLEL_PARTS concurrent Range requests, each written at its own offset."""
+    part_size = -(-total // PARALLEL_PARTS)
+    ranges = [(lo, min(lo + part_size, total) - 1) for lo in range(0, total, part_size)]
+    lock = threading.Lock()
+    progress = {"done": 0, "next_report": 0.0}
+
+    def on_write(n):
+        with lock:
+            progress["done"] += n
+            now = time.monotonic()
+            if now >= progress["next_report"]:
+                progress["next_report"] = now + 1.0
+                pct = min(progress["done"] / total * 100, 100.0)
+                print(f"\rDownloading {dest_path.name}: {pct:5.1f}%", end="", flush=True)
+
+    with open(dest_path, "wb") as f:
+        f.truncate(total)
+
+    def fetch_range(span):
+        lo, hi = span
+        with SESSION.get(url, headers={"Range": f"bytes={lo}-{hi}"}, stream=True, timeout=30) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise _RangeNotSupported(url)
+            r.raw.decode_content = True
+            # Own handle per worker (os.pwrite isn't available on Windows)
+            with open(dest_path, "r+b") as f:
+                f.seek(lo)
+                shutil.copyfileobj(r.raw, _CountingWriter(f, on_write), length=chunk_size)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            list(pool.map(fetch_range, ranges))
+        if progress["done"] != total:
+            raise IOError(f"range download of {dest_path.name} incomplete: {progress['done']} of {total} bytes")
+    except BaseException:
+        # The file was pre-sized, so a partial one would look complete on the next run
+        dest_path.unlink(missing_ok=True)
+        raise
+    print(f"\rDownloading {dest_path.name}: 100.0%")
+    return progress["done"]
+
 
 def download_stream(url, dest_path, chunk_size=1 << 20):
-    """Download a file with streaming and basic progress. Returns downloaded bytes or raises."""
-    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-    with requests.get(url, stream=True, headers=headers, allow_redirects=True, timeout=30) as r:
+    """Download a file with streaming and basic progress. Returns downloaded bytes or raises.
+
+    Large files from servers that accept byte ranges are fetched in PARALLEL_PARTS concurrent
+    pieces; anything else falls back to a single streamed GET.
+    """
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Resolve redirects once (GitHub releases bounce to a CDN) and see if ranges are allowed
+    try:
+        head = SESSION.head(url, allow_redirects=True, timeout=30)
+        total = int(head.headers.get("content-length", 0)) if head.ok else 0
+        if total >= PARALLEL_MIN_SIZE and head.headers.get("accept-ranges", "").lower() == "bytes":
+            try:
+                return _download_ranges(head.url, dest_path, total, chunk_size)
+            except _RangeNotSupported:
+                print(f"\nServer ignored range requests for {dest_path.name}; downloading sequentially")
+    except requests.RequestException:
+        pass  # HEAD not allowed - the plain GET below still works
+
+    with SESSION.get(url, stream=True, allow_redirects=True, timeout=30) as r:
         r.raise_for_status()
         total = int(r.headers.get("content-length", 0))
-        downloaded = 0
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        progress = {"done": 0}
+
+        def on_write(n):
+            before = progress["done"]
+            progress["done"] += n
+            if before // PROGRESS_STEP != progress["done"] // PROGRESS_STEP:
+                if total:
+                    pct = min(progress["done"] / total * 100, 100.0)
+                    print(f"\rDownloading {dest_path.name}: {pct:5.1f}%", end="", flush=True)
+                else:
+                    print(f"\rDownloading {dest_path.name}: {progress['done']} bytes", end="", flush=True)
+
+        # copyfileobj moves 1 MiB blocks straight from the socket to the file
+        r.raw.decode_content = True
         with open(dest_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total:
-                        pct = min(downloaded / total * 100, 100.0)
-                        print(f"\rDownloading {dest_path.name}: {pct:5.1f}%", end="", flush=True)
-                    else:
-                        print(f"\rDownloading {dest_path.name}: {downloaded} bytes", end="", flush=True)
-        print()
-    return downloaded
+            shutil.copyfileobj(r.raw, _CountingWriter(f, on_write), length=chunk_size)
+        print(f"\rDownloading {dest_path.name}: {progress['done']} bytes")
+    return progress["done"]
 
 
 def download_yolo_files():
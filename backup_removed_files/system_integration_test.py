@@ -104,6 +104,7 @@ class SystemTester:
         stats_frame.pack(fill=tk.X, pady=(0, 10))
         
         self.stats_text = tk.Text(stats_frame, height=8, width=80)
+        self._log_lines = 0  # Lines currently in stats_text, so trimming never reads it back
         scrollbar = ttk.Scrollbar(stats_frame, orient=tk.VERTICAL, command=self.stats_text.yview)
         self.stats_text.configure(yscrollcommand=scrollbar.set)
         
@@ -367,13 +368,14 @@ class SystemTester:
         log_message = f"[{timestamp}] {message}\n"
         
         self.stats_text.insert(tk.END, log_message)
-        self.stats_text.see(tk.END)
-        logger.info(message)
+        self._log_lines += log_message.count('\n')
         
         # Keep only last 100 lines
-        lines = self.stats_text.get("1.0", tk.END).split('\n')
-        if len(lines) > 100:
-            self.stats_text.delete("1.0", f"{len(lines)-100}.0")
+        if self._log_lines > 100:
+            self.stats_text.delete("1.0", f"{self._log_lines - 100 + 1}.0")
+            self._log_lines = 100
+        self.stats_text.see(tk.END)
+        logger.info(message)
             
     def run(self):
         """Start the GUI"""
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+⚙️ Robot Guardian - AOT Kernel Builder
+======================================
+
+Compiles the detection kernels from ``detection_kernels.py`` ahead of time into
+the native ``rg_kernels`` extension (``.pyd`` on Windows, ``.so`` elsewhere),
+so the controller never pays Numba's JIT compile stall on its first frame.
+
+``detection_kernels`` loads ``rg_kernels`` automatically when it is present and
+falls back to ``@njit`` / NumPy otherwise. Re-run after changing a kernel.
+
+Requirements:
+- pip install numba (build machine only)
+- A C compiler (MSVC Build Tools on Windows)
+
+Usage: python build_kernels.py
+
+Author: Robot Guardian System
+Date: September 2025
+"""
+
+import os
+
+from numba.pycc import CC
+
+import detection_kernels
+
+# Exact array types the detector passes in (AOT functions don't re-specialise)
+KERNEL_SIGNATURES = {
+    'bgr_to_chw_norm': 'void(u1[:,:,:], f4[:,:,:,:])',
+    'decode_nms': 'i8(f4[:,:], i8, f8, f8, f4[:,:], f4[:])',
+    'box_geometry': 'void(f4[:,:], i4[:,:], i4[:])',
+    'pick_direction': 'i8(i4[:,:], i4[:], b1, i8, i8, f8[:])',
+}
+
+
+def build():
+    if not detection_kernels.NUMBA_AVAILABLE:
+        raise SystemExit("❌ numba not installed. Install with: pip install numba")
+
+    cc = CC('rg_kernels')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+    for name, signature in KERNEL_SIGNATURES.items():
+        # Compile the plain Python source behind each @njit kernel
+        cc.export(name, signature)(detection_kernels.JIT_KERNELS[name].py_func)
+    cc.compile()
+    print(f"✅ Built rg_kernels in {cc.output_dir}")
+
+
+if __name__ == "__main__":
+    build()
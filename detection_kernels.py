@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+⚡ Robot Guardian - Detection Kernels
+====================================
+
+Per-frame numeric kernels used by the person detector and auto-tracking.
+
+With numba installed each kernel is JIT-compiled to a native, GIL-free loop
+(``cache=True`` keeps the compiled code on disk between runs). Without numba
+the same functions fall back to equivalent NumPy code, so callers never need
+to care which implementation is active.
+
+When the ahead-of-time ``rg_kernels`` extension has been built (see
+``build_kernels.py``) it is used instead, removing the first-frame JIT stall.
+
+Requirements:
+- Optional: pip install numba
+- Optional: python build_kernels.py (precompiled kernels)
+
+Author: Robot Guardian System
+Date: September 2025
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # optional JIT acceleration
+    NUMBA_AVAILABLE = False
+
+INV_255 = np.float32(1.0 / 255.0)
+
+# pick_direction decisions
+TRACK_HOLD, TRACK_APPROACH, TRACK_TOO_CLOSE, TRACK_RIGHT, TRACK_LEFT, TRACK_FOLLOW = range(6)
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def bgr_to_chw_norm(src_u8, dst_f32):
+        """Letterboxed BGR HWC uint8 → RGB NCHW float32 in [0, 1], written into dst"""
+        height, width = src_u8.shape[0], src_u8.shape[1]
+        for y in prange(height):
+            for x in range(width):
+                dst_f32[0, 2, y, x] = src_u8[y, x, 0] * INV_255
+                dst_f32[0, 1, y, x] = src_u8[y, x, 1] * INV_255
+                dst_f32[0, 0, y, x] = src_u8[y, x, 2] * INV_255
+
+    @njit(cache=True, fastmath=True)
+    def decode_nms(predictions, score_row, conf_threshold, iou_threshold, out_boxes, out_scores):
+        """Decode one class of a (4+classes, anchors) YOLOv8 output with greedy NMS.
+
+        Writes xyxy boxes (input-pixel space) and scores into the preallocated
+        outputs, highest score first, and returns how many were written.
+        """
+        scores = predictions[score_row]
+        anchors = scores.shape[0]
+        candidates = np.empty(anchors, dtype=np.int64)
+        found = 0
+        for i in range(anchors):
+            if scores[i] >= conf_threshold:
+                candidates[found] = i
+                found += 1
+        if found == 0:
+            return 0
+
+        candidates = candidates[:found]
+        order = candidates[np.argsort(-scores[candidates])]
+        x1 = np.empty(found, dtype=np.float32)
+        y1 = np.empty(found, dtype=np.float32)
+        x2 = np.empty(found, dtype=np.float32)
+        y2 = np.empty(found, dtype=np.float32)
+        for k in range(found):
+            i = order[k]
+            half_w = predictions[2, i] * 0.5
+            half_h = predictions[3, i] * 0.5
+            x1[k] = predictions[0, i] - half_w
+            y1[k] = predictions[1, i] - half_h
+            x2[k] = predictions[0, i] + half_w
+            y2[k] = predictions[1, i] + half_h
+
+        suppressed = np.zeros(found, dtype=np.bool_)
+        capacity = out_boxes.shape[0]
+        count = 0
+        for a in range(found):
+            if suppressed[a]:
+                continue
+            out_boxes[count, 0] = x1[a]
+            out_boxes[count, 1] = y1[a]
+            out_boxes[count, 2] = x2[a]
+            out_boxes[count, 3] = y2[a]
+            out_scores[count] = scores[order[a]]
+            count += 1
+            if count == capacity:
+                break
+
+            area_a = (x2[a] - x1[a]) * (y2[a] - y1[a])
+            for b in range(a + 1, found):
+                if suppressed[b]:
+                    continue
+                inter_w = min(x2[a], x2[b]) - max(x1[a], x1[b])
+                inter_h = min(y2[a], y2[b]) - max(y1[a], y1[b])
+                if inter_w <= 0 or inter_h <= 0:
+                    continue
+                inter = inter_w * inter_h
+                area_b = (x2[b] - x1[b]) * (y2[b] - y1[b])
+                if inter / (area_a + area_b - inter + 1e-6) > iou_threshold:
+                    suppressed[b] = True
+        return count
+
+    @njit(cache=True)
+    def box_geometry(boxes, out_rects, out_areas):
+        """Float xyxy boxes → int32 drawing rects and their pixel areas, written into the outputs"""
+        for i in range(boxes.shape[0]):
+            x1 = np.int32(boxes[i, 0])
+            y1 = np.int32(boxes[i, 1])
+            x2 = np.int32(boxes[i, 2])
+            y2 = np.int32(boxes[i, 3])
+            out_rects[i, 0] = x1
+            out_rects[i, 1] = y1
+            out_rects[i, 2] = x2
+            out_rects[i, 3] = y2
+            out_areas[i] = (x2 - x1) * (y2 - y1)
+
+else:
+
+    def bgr_to_chw_norm(src_u8, dst_f32):
+        """Letterboxed BGR HWC uint8 → RGB NCHW float32 in [0, 1], written into dst"""
+        np.multiply(src_u8[:, :, ::-1].transpose(2, 0, 1), INV_255,
+                    out=dst_f32[0], casting='unsafe')
+
+    def decode_nms(predictions, score_row, conf_threshold, iou_threshold, out_boxes, out_scores):
+        """Decode one class of a (4+classes, anchors) YOLOv8 output with greedy NMS.
+
+        Writes xyxy boxes (input-pixel space) and scores into the preallocated
+        outputs, highest score first, and returns how many were written.
+        """
+        scores = predictions[score_row]
+        candidates = np.flatnonzero(scores >= conf_threshold)
+        if candidates.size == 0:
+            return 0
+
+        order = candidates[np.argsort(-scores[candidates])]
+        cx, cy = predictions[0, order], predictions[1, order]
+        half_w, half_h = predictions[2, order] * 0.5, predictions[3, order] * 0.5
+        x1, y1, x2, y2 = cx - half_w, cy - half_h, cx + half_w, cy + half_h
+        areas = (x2 - x1) * (y2 - y1)
+
+        remaining = np.arange(order.size)
+        capacity = out_boxes.shape[0]
+        count = 0
+        while remaining.size > 0 and count < capacity:
+            a = remaining[0]
+            out_boxes[count] = (x1[a], y1[a], x2[a], y2[a])
+            out_scores[count] = scores[order[a]]
+            count += 1
+
+            rest = remaining[1:]
+            inter_w = np.maximum(0.0, np.minimum(x2[a], x2[rest]) - np.maximum(x1[a], x1[rest]))
+            inter_h = np.maximum(0.0, np.minimum(y2[a], y2[rest]) - np.maximum(y1[a], y1[rest]))
+            inter = inter_w * inter_h
+            iou = inter / (areas[a] + areas[rest] - inter + 1e-6)
+            remaining = rest[iou <= iou_threshold]
+        return count
+
+    def box_geometry(boxes, out_rects, out_areas):
+        """Float xyxy boxes → int32 drawing rects and their pixel areas, written into the outputs"""
+        np.copyto(out_rects, boxes, casting='unsafe')
+        np.multiply(out_rects[:, 2] - out_rects[:, 0], out_rects[:, 3] - out_rects[:, 1], out=out_areas)
+
+
+def _pick_direction(rects, areas, largest, frame_width, frame_height, out_stats):
+    """Choose the tracking target (largest box, or the first) and classify where it sits.
+
+    Returns one of the TRACK_* codes and writes the target's horizontal offset
+    and frame coverage, both in percent, into out_stats[0] and out_stats[1].
+    """
+    idx = 0
+    if largest:
+        for i in range(1, areas.shape[0]):
+            if areas[i] > areas[idx]:
+                idx = i
+
+    center_x = (rects[idx, 0] + rects[idx, 2]) * 0.5
+    area = float(areas[idx])
+    total_pixels = float(frame_width * frame_height)
+    half_width = frame_width * 0.5
+    offset_x = center_x - half_width
+    offset_percent = abs(offset_x) / half_width * 100.0
+    out_stats[0] = offset_percent
+    out_stats[1] = area / total_pixels * 100.0 if total_pixels > 0 else 0.0
+
+    # Distance first: very small → approach, very large → hold
+    if area < total_pixels * 0.03:
+        return TRACK_APPROACH
+    if area > total_pixels * 0.38:
+        return TRACK_TOO_CLOSE
+
+    # Lateral alignment only outside the 18% dead zone
+    x_threshold = frame_width * 0.18
+    if offset_x > x_threshold and offset_percent > 18.0:
+        return TRACK_RIGHT
+    if offset_x < -x_threshold and offset_percent > 18.0:
+        return TRACK_LEFT
+
+    # Keep drifting forward until the ideal following distance
+    if area < total_pixels * 0.22:
+        return TRACK_FOLLOW
+    return TRACK_HOLD
+
+
+# Scalar branching - the same source serves as the JIT kernel and the fallback
+pick_direction = njit(cache=True)(_pick_direction) if NUMBA_AVAILABLE else _pick_direction
+
+# Keep the JIT dispatchers reachable - build_kernels.py compiles their sources
+JIT_KERNELS = {
+    'bgr_to_chw_norm': bgr_to_chw_norm,
+    'decode_nms': decode_nms,
+    'box_geometry': box_geometry,
+    'pick_direction': pick_direction,
+}
+
+try:
+    from rg_kernels import bgr_to_chw_norm, box_geometry, decode_nms, pick_direction
+    AOT_KERNELS = True
+except ImportError:  # optional precompiled kernels
+    AOT_KERNELS = False
+
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+📹 Robot Guardian - MJPEG Stream Client
+=======================================
+
+Reads the Pi's ``/video_feed`` (multipart/x-mixed-replace MJPEG) over one
+long-lived ``http.client`` connection and splits it into JPEG frames by their
+SOI/EOI markers.
+
+``MjpegClient`` mirrors the parts of ``cv2.VideoCapture`` the controller uses
+(``isOpened``/``grab``/``retrieve``/``read``/``release``), so it can be swapped
+in directly. ``grab()`` only extracts the JPEG bytes; decoding happens in
+``retrieve()``, which lets callers skip stale frames without decoding them.
+A dropped connection is reopened from ``grab()`` with exponential backoff, so a
+short Wi-Fi outage only costs the frames it spans.
+
+Author: Robot Guardian System
+Date: September 2025
+"""
+
+import http.client
+import time
+from urllib.parse import urlsplit
+
+import cv2
+import numpy as np
+
+JPEG_SOI = b'\xff\xd8'
+JPEG_EOI = b'\xff\xd9'
+
+
+class MjpegClient:
+    """cv2.VideoCapture-compatible reader for an HTTP MJPEG stream"""
+
+    def __init__(self, url, timeout=5.0, read_size=65536, max_backoff=5.0):
+        parts = urlsplit(url)
+        self.url = url
+        self.read_size = read_size
+        self.max_backoff = max_backoff
+        self._host, self._port, self._timeout = parts.hostname, parts.port or 80, timeout
+        self._path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        self._conn = None
+        self._response = None
+        self._released = False
+        self._backoff = 0.5          # seconds before the next reconnect attempt, doubles per failure
+        self._retry_at = 0.0
+        self._stream = bytearray()   # unparsed bytes from the socket, reused
+        self._jpeg = bytearray()     # last grabbed frame, decoded on retrieve()
+
+        self._connect()  # first connect raises, like a VideoCapture that won't open
+
+    def _connect(self):
+        """Open the stream request; raises ConnectionError/OSError on failure"""
+        conn = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+        try:
+            conn.request('GET', self._path, headers={'Connection': 'keep-alive'})
+            response = conn.getresponse()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            raise
+        if response.status != 200:
+            conn.close()
+            raise ConnectionError(f"MJPEG stream returned HTTP {response.status}")
+        self._conn, self._response = conn, response
+        self._stream.clear()
+
+    def _disconnect(self):
+        response, self._response = self._response, None
+        if response is not None:
+            response.close()
+        if self._conn is not None:
+            self._conn.close()
+
+    def _reconnect(self):
+        """One reconnect attempt if the backoff has elapsed; True once the stream is back"""
+        now = time.monotonic()
+        if now < self._retry_at:
+            return False
+        try:
+            self._connect()
+        except (OSError, http.client.HTTPException):
+            self._retry_at = now + self._backoff
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+            return False
+        self._backoff = 0.5
+        return True
+
+    def isOpened(self):
+        return not self._released
+
+    def buffered(self):
+        """True if a complete JPEG is already waiting, i.e. grab() won't touch the socket"""
+        start = self._stream.find(JPEG_SOI)
+        return start >= 0 and self._stream.find(JPEG_EOI, start + 2) >= 0
+
+    def grab(self):
+        """Pull the next complete JPEG out of the stream without decoding it"""
+        if self._released:
+            return False
+        if self._response is None and not self._reconnect():
+            return False
+        stream = self._stream
+        try:
+            while True:
+                start = stream.find(JPEG_SOI)
+                if start >= 0:
+                    end = stream.find(JPEG_EOI, start + 2)
+                    if end >= 0:
+                        self._jpeg[:] = memoryview(stream)[start:end + 2]
+                        del stream[:end + 2]
+                        return True
+                    del stream[:start]
+                elif len(stream) > 1:
+                    del stream[:-1]  # keep a trailing 0xFF that may start the next SOI
+
+                # read1 returns whatever has arrived (one chunk at most) instead of
+                # blocking until read_size bytes are buffered
+                data = self._response.read1(self.read_size)
+                if not data:
+                    break
+                stream += data
+        except (OSError, http.client.HTTPException):
+            pass
+        # Stream ended or broke - drop it; the next grab() reconnects (with backoff)
+        self._disconnect()
+        self._retry_at = 0.0
+        return False
+
+    def retrieve(self, image=None):
+        """Decode the last grabbed JPEG, returns (ok, frame) like VideoCapture"""
+        if not self._jpeg:
+            return False, image
+        frame = cv2.imdecode(np.frombuffer(self._jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return False, image
+        # The Python imdecode has no dst argument; copying keeps the caller's buffer in use
+        if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, image
+        return self.retrieve(image)
+
+    def set(self, prop_id, value):
+        return False  # nothing to tune - there is no internal frame queue
+
+    def get(self, prop_id):
+        return 0.0
+
+    def release(self):
+        self._released = True
+        self._disconnect()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+🧠 Robot Guardian - ONNX Runtime Person Detector
+================================================
+
+CPU-optimised YOLOv8 person detection for the Windows AI Control Center.
+
+The PyTorch/ultralytics predictor is convenient but slow on CPU. This module
+runs an exported ``yolov8n.onnx`` through ONNX Runtime (fused graph + SIMD
+kernels) and does its own letterbox preprocessing and person-only NMS.
+
+Requirements:
+- pip install onnxruntime opencv-python numpy
+- ultralytics is only needed once, to export ``yolov8n.pt`` → ``yolov8n.onnx``
+- Optional: pip install py-cpuinfo (enables the INT8/VNNI model when supported)
+- Optional: pip install numba (JIT-compiled pre/post-processing kernels)
+- Without onnxruntime the same model runs through OpenCV DNN (OpenVINO backend
+  when OpenCV was built with it)
+
+Author: Robot Guardian System
+Date: September 2025
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from detection_kernels import bgr_to_chw_norm, decode_nms
+
+try:
+    import onnxruntime as ort
+except ImportError:  # optional accelerated backend
+    ort = None
+
+try:
+    import cpuinfo
+except ImportError:  # optional, only used to detect VNNI support
+    cpuinfo = None
+
+PERSON_CLASS_ID = 0
+LETTERBOX_COLOR = (114, 114, 114)
+MAX_DETECTIONS = 100
+MAX_BATCH = 4
+VNNI_CPU_FLAGS = {'avx512_vnni', 'avx512vnni', 'avx_vnni', 'avxvnni'}
+
+
+def onnx_runtime_available():
+    """Return True when onnxruntime can be used for inference"""
+    return ort is not None
+
+
+def opencv_dnn_available():
+    """Return True when this OpenCV build can load ONNX models"""
+    return hasattr(cv2, 'dnn') and hasattr(cv2.dnn, 'readNetFromONNX')
+
+
+def export_onnx_model(weights_path='yolov8n.pt', onnx_path='yolov8n.onnx', imgsz=640, dynamic=True):
+    """One-time export of the ultralytics weights to ONNX (dynamic axes allow batching)"""
+    from ultralytics import YOLO
+
+    exported = YOLO(weights_path).export(format='onnx', imgsz=imgsz, half=False, dynamic=dynamic,
+                                         verbose=False)
+    if exported and os.path.abspath(exported) != os.path.abspath(onnx_path):
+        os.replace(exported, onnx_path)
+    return onnx_path
+
+
+def cpu_supports_vnni():
+    """Return True when the CPU has int8 dot-product (VNNI) instructions"""
+    if cpuinfo is None:
+        return False
+    try:
+        flags = set(cpuinfo.get_cpu_info().get('flags', []))
+    except Exception:
+        return False
+    return bool(flags & VNNI_CPU_FLAGS)
+
+
+def quantize_onnx_model(fp32_path, int8_path, input_name, calibration_blobs):
+    """Static INT8 quantization (QDQ, per-channel) calibrated on real camera frames"""
+    from onnxruntime.quantization import (CalibrationDataReader, QuantFormat, QuantType,
+                                          quantize_static)
+
+    class FrameCalibrationReader(CalibrationDataReader):
+        def __init__(self, blobs):
+            self._blobs = iter(blobs)
+
+        def get_next(self):
+            blob = next(self._blobs, None)
+            return None if blob is None else {input_name: blob}
+
+    quantize_static(fp32_path, int8_path, FrameCalibrationReader(calibration_blobs),
+                    quant_format=QuantFormat.QDQ,
+                    per_channel=True,
+                    weight_type=QuantType.QInt8,
+                    activation_type=QuantType.QUInt8)
+    return int8_path
+
+
+class OnnxPersonDetector:
+    """YOLOv8 ONNX model wrapper that only reports the person class"""
+
+    def __init__(self, model_path, num_threads=None, input_size=640):
+        if ort is None:
+            raise RuntimeError("onnxruntime not installed. Install with: pip install onnxruntime")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads or max(1, (os.cpu_count() or 2) // 2)
+
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Static exports carry the square input size, dynamic ones use the requested size
+        size = model_input.shape[2]
+        self.input_size = size if isinstance(size, int) else input_size
+        # Only dynamic-batch exports can take several frames per run
+        self.max_batch = MAX_BATCH if not isinstance(model_input.shape[0], int) else 1
+        self._init_buffers()
+        self._init_io_binding()
+
+    def _init_buffers(self):
+        """Preallocated per-frame buffers - the hot loop never allocates"""
+        self._batch_blob = np.empty((self.max_batch, 3, self.input_size, self.input_size), dtype=np.float32)
+        self._in_blob = self._batch_blob[:1]
+        self._letterbox_tmp = np.empty((self.input_size, self.input_size, 3), dtype=np.uint8)
+        self._resized_tmp = None
+        self._letterbox_key = None
+        self._letterbox_geometry = None
+        self._out_boxes = np.empty((MAX_DETECTIONS, 4), dtype=np.float32)
+        self._out_scores = np.empty(MAX_DETECTIONS, dtype=np.float32)
+
+    def _init_io_binding(self):
+        """Bind the input blob and a preallocated output tensor once, per batch size"""
+        self._batch_blob[:1] = 0
+        sample = self.session.run(None, {self.input_name: self._batch_blob[:1]})[0]
+        self._output_name = self.session.get_outputs()[0].name
+        self._out_buf = np.empty((self.max_batch,) + sample.shape[1:], dtype=np.float32)
+        self._io_bindings = {}
+        for n in range(1, self.max_batch + 1):
+            binding = self.session.io_binding()
+            blob, out = self._batch_blob[:n], self._out_buf[:n]
+            binding.bind_input(self.input_name, 'cpu', 0, np.float32, blob.shape, blob.ctypes.data)
+            binding.bind_output(self._output_name, 'cpu', 0, np.float32, out.shape, out.ctypes.data)
+            self._io_bindings[n] = binding
+
+    def _run(self, blob):
+        """Forward pass, returns the raw (N, 4+classes, anchors) output"""
+        binding = self._io_bindings.get(blob.shape[0])
+        if binding is None or blob.ctypes.data != self._batch_blob.ctypes.data:
+            return self.session.run(None, {self.input_name: blob})[0]
+        # ORT reads the blob and writes the reused output buffer in place
+        self.session.run_with_iobinding(binding)
+        return self._out_buf[:blob.shape[0]]
+
+    def _letterbox_geometry_for(self, frame_shape):
+        """Scale/padding for a frame shape, recomputed only when the stream size changes"""
+        key = frame_shape[:2]
+        if key != self._letterbox_key:
+            size = self.input_size
+            h, w = key
+            scale = min(size / w, size / h)
+            new_w, new_h = int(round(w * scale)), int(round(h * scale))
+            pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+
+            self._letterbox_tmp[:] = LETTERBOX_COLOR
+            self._resized_tmp = np.empty((new_h, new_w, 3), dtype=np.uint8)
+            self._letterbox_key = key
+            self._letterbox_geometry = (scale, new_w, new_h, pad_x, pad_y)
+        return self._letterbox_geometry
+
+    def _letterbox_into(self, frame, out_u8):
+        """Resize a BGR frame into the padded square canvas ``out_u8`` in place"""
+        scale, new_w, new_h, pad_x, pad_y = self._letterbox_geometry_for(frame.shape)
+        cv2.resize(frame, (new_w, new_h), dst=self._resized_tmp, interpolation=cv2.INTER_LINEAR)
+        out_u8[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = self._resized_tmp
+        return scale, (pad_x, pad_y)
+
+    def preprocess(self, frame, blob=None):
+        """Letterbox a BGR frame into a (1, 3, S, S) slice of the reused float32 blob"""
+        blob = self._in_blob if blob is None else blob
+        scale, pad = self._letterbox_into(frame, self._letterbox_tmp)
+        # BGR → RGB, HWC → CHW, 0..255 → 0..1 straight into the input blob
+        bgr_to_chw_norm(self._letterbox_tmp, blob)
+        return blob, scale, pad
+
+    def postprocess(self, output, scale, pad, frame_shape, conf_threshold, iou_threshold):
+        """Decode one (4+classes, anchors) YOLOv8 output sample for the person class.
+
+        Returns views into reused buffers - copy them to keep past the next frame.
+        """
+        count = decode_nms(output, 4 + PERSON_CLASS_ID, conf_threshold, iou_threshold,
+                           self._out_boxes, self._out_scores)
+        boxes = self._out_boxes[:count]
+        if count == 0:
+            return boxes, self._out_scores[:0]
+
+        # Undo the letterbox so boxes are in original frame pixels
+        pad_x, pad_y = pad
+        boxes -= (pad_x, pad_y, pad_x, pad_y)
+        boxes /= scale
+
+        frame_h, frame_w = frame_shape[:2]
+        np.clip(boxes[:, 0::2], 0, frame_w - 1, out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, frame_h - 1, out=boxes[:, 1::2])
+        return boxes, self._out_scores[:count]
+
+    def detect(self, frame, conf_threshold=0.5, iou_threshold=0.45):
+        """Run person detection, returns (xyxy boxes in frame pixels, confidences)"""
+        blob, scale, pad = self.preprocess(frame)
+        output = self._run(blob)
+        return self.postprocess(output[0], scale, pad, frame.shape, conf_threshold, iou_threshold)
+
+    def detect_batch(self, frames, conf_threshold=0.5, iou_threshold=0.45):
+        """Run up to ``max_batch`` frames through one session call, one result per frame"""
+        if len(frames) == 1:
+            boxes, scores = self.detect(frames[0], conf_threshold, iou_threshold)
+            return [(boxes.copy(), scores.copy())]
+
+        results = []
+        for start in range(0, len(frames), self.max_batch):
+            chunk = frames[start:start + self.max_batch]
+            geometry = []
+            for i, frame in enumerate(chunk):
+                _, scale, pad = self.preprocess(frame, self._batch_blob[i:i + 1])
+                geometry.append((scale, pad, frame.shape))
+
+            outputs = self._run(self._batch_blob[:len(chunk)])
+            for output, (scale, pad, shape) in zip(outputs, geometry):
+                boxes, scores = self.postprocess(output, scale, pad, shape, conf_threshold, iou_threshold)
+                # Output buffers are shared between samples, keep a copy per frame
+                results.append((boxes.copy(), scores.copy()))
+        return results
+
+
+class OpenCVDnnPersonDetector(OnnxPersonDetector):
+    """Same YOLOv8 ONNX model run through cv2.dnn - no onnxruntime/PyTorch needed"""
+
+    def __init__(self, model_path, num_threads=None, input_size=640):
+        if not opencv_dnn_available():
+            raise RuntimeError("This OpenCV build has no DNN module")
+
+        if num_threads:
+            cv2.setNumThreads(num_threads)
+        self.model_path = model_path
+        self.session = None
+        self.input_name = 'images'
+        self.input_size = input_size
+        self.max_batch = 1
+        self.net = cv2.dnn.readNetFromONNX(model_path)
+        self._init_buffers()  # same per-frame buffers as the ONNX Runtime path
+
+        # OpenVINO (Inference Engine) when OpenCV was built with it, plain OpenCV otherwise
+        self.backend = 'openvino'
+        try:
+            self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE)
+            self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+            self._run(self._in_blob)  # backend errors only surface on the first forward
+        except cv2.error:
+            self.backend = 'opencv'
+            self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+            self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def _run(self, blob):
+        self.net.setInput(blob)
+        return self.net.forward()
+
+
+# --- Out-of-process detection -------------------------------------------------
+# The child process owns the real detector; frames reach it through shared memory
+# so only the tiny box/score arrays are pickled.
+
+_worker_detector = None
+_worker_shm = None
+
+
+def _init_worker(backend, model_path, input_size, num_threads):
+    global _worker_detector
+    detector_cls = OpenCVDnnPersonDetector if backend == 'opencv' else OnnxPersonDetector
+    _worker_detector = detector_cls(model_path, num_threads=num_threads, input_size=input_size)
+
+
+def _worker_info():
+    return _worker_detector.input_name, _worker_detector.input_size
+
+
+def _detect_shared(shm_name, shape, count, conf_threshold, iou_threshold):
+    global _worker_shm
+    if _worker_shm is None or _worker_shm.name != shm_name:
+        if _worker_shm is not None:
+            _worker_shm.close()
+        _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((count,) + shape, dtype=np.uint8, buffer=_worker_shm.buf)
+    return _worker_detector.detect_batch(list(frames), conf_threshold, iou_threshold)
+
+
+class ProcessPersonDetector(OnnxPersonDetector):
+    """Runs an ONNX person detector in a child process, off this process's GIL.
+
+    Exposes the same detect/detect_batch/preprocess API; preprocess stays local
+    so INT8 calibration can still sample frames.
+    """
+
+    def __init__(self, model_path, backend='onnxruntime', num_threads=None, input_size=640):
+        self.model_path = model_path
+        self.backend = backend
+        self.session = None
+        self.max_batch = MAX_BATCH
+        self._executor = ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                             initargs=(backend, model_path, input_size, num_threads))
+        self._shm = None
+        self._shm_frame_shape = None
+        try:
+            # Fail here, like the in-process detectors, if the child can't load the model
+            self.input_name, self.input_size = self._executor.submit(_worker_info).result()
+        except Exception:
+            self._executor.shutdown(wait=False)
+            raise
+        self._init_buffers()
+
+    def _frames_view(self, frame_shape):
+        """(max_batch, H, W, 3) view of the shared frame buffer, reallocated on size change"""
+        if frame_shape != self._shm_frame_shape:
+            self._release_shm()
+            size = self.max_batch * int(np.prod(frame_shape))
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shm_frame_shape = frame_shape
+        return np.ndarray((self.max_batch,) + frame_shape, dtype=np.uint8, buffer=self._shm.buf)
+
+    def _release_shm(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            self._shm_frame_shape = None
+
+    def detect(self, frame, conf_threshold=0.5, iou_threshold=0.45):
+        """Run person detection, returns (xyxy boxes in frame pixels, confidences)"""
+        return self.detect_batch([frame], conf_threshold, iou_threshold)[0]
+
+    def detect_batch(self, frames, conf_threshold=0.5, iou_threshold=0.45):
+        """Copy frames into shared memory and detect them in the child, one result per frame"""
+        shape = frames[0].shape
+        if any(frame.shape != shape for frame in frames):
+            return [self.detect(frame, conf_threshold, iou_threshold) for frame in frames]
+
+        results = []
+        for start in range(0, len(frames), self.max_batch):
+            chunk = frames[start:start + self.max_batch]
+            shared = self._frames_view(shape)
+            for i, frame in enumerate(chunk):
+                shared[i] = frame
+            results.extend(self._executor.submit(_detect_shared, self._shm.name, shape, len(chunk),
+                                                 conf_threshold, iou_threshold).result())
+        return results
+
+    def close(self):
+        """Stop the child process and free the shared frame buffer"""
+        self._executor.shutdown(wait=True)
+        self._release_shm()
+
@@ -1607,12 +1607,15 @@ def move_robot():
     if request.method == 'OPTIONS':  # CORS preflight
         return ('', 204)
     try:
-        data = request.get_json()
-        
-        if not data or 'direction' not in data:
-            return jsonify({'status': 'error', 'message': 'Missing direction parameter'}), 400
-            
-        direction = data['direction'].upper().strip()
+        # Compact form: POST /move?d=F with an empty body; JSON {"direction": "F"} still works
+        direction = request.args.get('d')
+        if direction is None:
+            data = request.get_json(silent=True)
+            if not data or 'direction' not in data:
+                return jsonify({'status': 'error', 'message': 'Missing direction parameter'}), 400
+            direction = data['direction']
+
+        direction = direction.upper().strip()
         
         # Validate command
         valid_commands = ['F', 'B', 'L', 'R', 'S']
@@ -1646,6 +1649,59 @@ def move_robot():
             'message': f'Server error: {str(e)}'
         }), 500
 
+@app.route('/batch_move', methods=['POST', 'OPTIONS'])
+def batch_move():
+    """Run a pipeline of movement commands in one request, pausing between them"""
+    if request.method == 'OPTIONS':  # CORS preflight
+        return ('', 204)
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Body must be a JSON object'}), 400
+        pipeline = data.get('pipeline')
+        if not isinstance(pipeline, list) or not pipeline:
+            return jsonify({'status': 'error', 'message': 'Missing pipeline list'}), 400
+        if len(pipeline) > 20:
+            return jsonify({'status': 'error', 'message': 'Pipeline too long (max 20 commands)'}), 400
+        delay_ms = data.get('inter_delay_ms', 0)
+        # bool is an int subclass; the range check also rejects NaN
+        if isinstance(delay_ms, bool) or not isinstance(delay_ms, (int, float)) or not 0 <= delay_ms <= 5000:
+            return jsonify({'status': 'error', 'message': 'inter_delay_ms must be a number from 0 to 5000'}), 400
+        inter_delay = delay_ms / 1000.0
+        # Capped so one request can't hold a worker (and the robot) for long
+        if inter_delay * (len(pipeline) - 1) > 5.0:
+            return jsonify({'status': 'error', 'message': 'Pipeline too slow (max 5 s of delays in total)'}), 400
+
+        valid_commands = ['F', 'B', 'L', 'R', 'S']
+        results = []
+        for index, step in enumerate(pipeline):
+            if index and inter_delay:
+                time.sleep(inter_delay)
+            direction = str(step.get('direction', '') if isinstance(step, dict) else '').upper().strip()
+            if direction not in valid_commands:
+                results.append({
+                    'status': 'error',
+                    'message': f'Invalid direction: {direction}. Valid: {valid_commands}',
+                    'command': direction
+                })
+                continue
+            success = server.send_uart_command(direction)
+            results.append({
+                'status': 'success' if success else 'error',
+                'message': f'Command {direction} sent successfully' if success else 'Failed to send command to ESP32',
+                'uart_status': 'connected' if server.uart_connected else 'disconnected',
+                'command': direction
+            })
+
+        return jsonify({'status': 'success', 'results': results})
+
+    except Exception as e:
+        logger.error(f"❌ Batch move error: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Server error: {str(e)}'
+        }), 500
+
 @app.route('/status', methods=['GET'])
 def get_status():
     """Get system status"""
@@ -11,6 +11,10 @@ Runs on Windows PC to:
 
 Requirements:
 - pip install opencv-python ultralytics requests tkinter pillow numpy
+- Optional: pip install onnxruntime (2-4x faster CPU inference)
+- Optional: WINDOWS_YOLO_BACKEND=opencv runs the ONNX model through OpenCV DNN
+  (OpenVINO when available); ultralytics/PyTorch are then only needed for the
+  one-time ONNX export
 
 Usage: python windows_ai_controller.py
 
@@ -18,31 +22,93 @@ Author: Robot Guardian System
 Date: September 2025
 """
 
+import atexit
+import ctypes
+import http.client
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 import cv2
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit
 import threading
 import time
 import queue
 from datetime import datetime
 import json
 from PIL import Image, ImageTk
-from ultralytics import YOLO
 import logging
 import socket
-import torch
 import collections
 from flask import Flask, Response, render_template_string
 import pygame
+from detection_kernels import (TRACK_APPROACH, TRACK_FOLLOW, TRACK_HOLD, TRACK_LEFT, TRACK_RIGHT,
+                               TRACK_TOO_CLOSE, box_geometry, pick_direction)
+from mjpeg_client import MjpegClient
+from person_detector import (OnnxPersonDetector, OpenCVDnnPersonDetector, ProcessPersonDetector,
+                             cpu_supports_vnni, export_onnx_model, onnx_runtime_available,
+                             opencv_dnn_available, quantize_onnx_model)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class LowLatencyHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets flush tiny command bodies immediately (no Nagle)"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def enable_high_resolution_timer():
+    """Ask Windows for 1 ms timer resolution (default ~15.6 ms) so sleeps and
+    millisecond command timings behave as written; no-op on other platforms"""
+    try:
+        winmm = ctypes.WinDLL('winmm')
+        winmm.timeBeginPeriod(1)
+        atexit.register(winmm.timeEndPeriod, 1)
+        return True
+    except (AttributeError, OSError):
+        return False
+
+# The five possible JSON /move bodies, encoded once
+MOVE_JSON_BODIES = {c: b'{"direction":"%s"}' % c.encode() for c in 'FBLRS'}
+
+# Last whole second seen by log() and its "HH:MM:SS" form - strftime runs once per second
+_ts_cache = [0, ""]
+
+# 360° search phases (indices into WindowsAIController.SEARCH_PHASES)
+SEARCH_SCAN, SEARCH_PRE_TURN, SEARCH_MICRO_TURN, SEARCH_STOP_SPAM, SEARCH_LONG_PAUSE, SEARCH_CYCLE_REST = range(6)
+
 class WindowsAIController:
+    # pick_direction code → (command, log message)
+    TRACK_DECISIONS = {
+        TRACK_APPROACH: ('F', "🚶 Closing distance (size {area:.1f}%)"),
+        TRACK_TOO_CLOSE: ('S', "🛑 Person extremely close - holding position"),
+        TRACK_RIGHT: ('R', "↪️ Adjusting right ({offset:.1f}% offset)"),
+        TRACK_LEFT: ('L', "↩️ Adjusting left ({offset:.1f}% offset)"),
+        TRACK_FOLLOW: ('F', "🚶 Continuing forward (target 22.0% area)"),
+        TRACK_HOLD: ('S', None),
+    }
+
+    # (duration_s, turn command, next phase, overlay text) - None duration waits for the turn sequence
+    SEARCH_PHASES = (
+        (0.5, None, SEARCH_PRE_TURN, "🔍 Scanning ({elapsed:.2f}s/0.50s)"),    # quick scan before turning
+        (0.05, None, SEARCH_MICRO_TURN, "⚙️ Stabilising ({elapsed:.2f}s/0.05s)"),
+        (0.12, 'R', SEARCH_STOP_SPAM, "↻ Turning ({elapsed:.2f}s/0.12s)"),
+        (None, None, SEARCH_LONG_PAUSE, "🛑 Settling ({stops_sent}/{total_stops})"),
+        (0.25, None, SEARCH_SCAN, "⏸️ Pause {remaining:.2f}s"),                 # 250ms pause between turns
+        (0.25, None, SEARCH_SCAN, "😴 Rest {remaining:.2f}s"),                  # short rest between cycles
+    )
+
     def __init__(self):
         # ⚠️ UPDATE THESE URLs WITH YOUR PI ⚠️
         self.PI_BASE_URL = "http://192.168.27.192:5000"  # Updated by set_pi_server_url.py
@@ -50,8 +116,12 @@ class WindowsAIController:
         if env_pi_url:
             self.PI_BASE_URL = env_pi_url.rstrip("/")
         
+        # Millisecond scheduler quantum for the command/search timing below
+        self.high_res_timer = enable_high_resolution_timer()
+
         # GUI setup
         self.root = tk.Tk()
+        self._log_buf = collections.deque(maxlen=50)  # line count of each entry in the log widget
         self.root.title("🤖 Robot Guardian - AI Control Center")
         self.root.geometry("1000x800")
         self.root.configure(bg='#2b2b2b')
@@ -63,6 +133,38 @@ class WindowsAIController:
         self.tracking_active = False
         self.current_frame = None
         self.frame_lock = threading.Lock()
+        # Frame grabber: capture thread queues the newest frames in a buffer ring
+        self.max_pending_frames = 4          # Backlog that can be batched into one inference
+        self.grab_slots = 2 * self.max_pending_frames + 1
+        self._grab_buffers = [None] * self.grab_slots
+        self._grab_times = [0.0] * self.grab_slots
+        self._pending_slots = collections.deque(maxlen=self.max_pending_frames)
+        self._reading_slots = ()             # slots the inference thread is using
+        self.max_grab_drain = 4              # Buffered frames skipped per capture
+        self._frame_ready = threading.Condition(self.frame_lock)
+
+        # One keep-alive HTTP connection to the Pi, reused by every request
+        self._http = requests.Session()
+        # One quick retry for Wi-Fi blips and gateway errors - never after a read failure, which
+        # could repeat a command the robot already executed. A small blocking pool bounds sockets.
+        retry = Retry(total=1, connect=1, read=0, backoff_factor=0, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(['GET', 'POST']), raise_on_status=False)
+        self._http.mount('http://', LowLatencyHTTPAdapter(pool_connections=1, pool_maxsize=4, pool_block=True,
+                                                      max_retries=retry))
+        self._http.headers['Connection'] = 'keep-alive'
+
+        # Movement commands are posted by a worker so the vision loop never waits on HTTP
+        self._cmd_q = queue.Queue(maxsize=1)   # Single slot - the newest command wins
+        self._move_query_supported = True   # POST /move?d=F, falls back to a JSON body
+        self._move_query_probed = False     # first ?d= reply decides whether the Pi supports it
+        self._last_sent_cmd = None
+        self._last_sent_time = 0.0
+        # The worker's own keep-alive connection - /move skips the requests stack entirely
+        self._cmd_conn = None
+        self._cmd_conn_url = None
+        self._cmd_headers = {'Connection': 'keep-alive', 'Content-Type': 'application/json'}
+        self._cmd_query_headers = {'Connection': 'keep-alive'}  # ?d= requests carry no body
+        threading.Thread(target=self._cmd_worker, daemon=True).start()
         
         # Person tracking settings
         self.auto_tracking = tk.BooleanVar(value=False)
@@ -71,14 +173,27 @@ class WindowsAIController:
         
         # Performance monitoring
         self.fps_counter = 0
-        self.fps_start_time = time.time()
+        self.fps_start_time = time.perf_counter()
         self.current_fps = 0
+        self._fps_fmt = "FPS: {:.1f}".format
         self.commands_sent = 0
         self.last_command_time = 0
         self.command_cooldown = 0.1  # Reduced from 0.3 to 0.1 seconds for faster response
         # Gentle turn sequencing state
         self.pending_turn_sequence = None
         self.last_turn_sequence_info = {'stops_sent': 0, 'total_stops': 0}
+        # 360° search state (driven by SEARCH_PHASES)
+        self.search_active = False
+        self.search_start_time = 0
+        self.search_last_command_time = 0
+        self._search_phase_idx = SEARCH_SCAN
+        self.total_micro_turns = 0
+        self.target_micro_turns = 36  # 36 × 10° ≈ 360°
+        self.current_cycle = 1
+        self.last_auto_command = 'S'
+        self._track_stats = np.zeros(2, dtype=np.float64)  # pick_direction: offset %, area %
+        self._search_overlay_state = (False, "", "")  # last overlay pushed to Tk
+        self._search_overlay_time = 0.0
 
         # Multi-mode behaviour (care companion, watchdog, edumate)
         self.operating_mode = 'care_companion'
@@ -113,8 +228,22 @@ class WindowsAIController:
         # Inference performance tuning - OPTIMIZED
         self.inference_size = 224            # Smaller size for much faster inference (224 vs 320)
         self.max_inference_fps = 5           # Reduced from 8 to 5 FPS to prevent overload
+        self._inference_buf = np.empty((self.inference_size, self.inference_size, 3), dtype=np.uint8)
         self.last_inference_time = 0
         self.model_device = 'cpu'            # will be set appropriately when model loads
+        self.onnx_model_path = 'yolov8n.onnx'
+        self.int8_model_path = 'yolov8n_int8.onnx'
+        self.onnx_detector = None            # ONNX Runtime backend (preferred on CPU)
+        # Run the ONNX detector in a child process so pre/post-processing never contends
+        # with Tk for the GIL (WINDOWS_YOLO_SUBPROCESS=0 keeps it in-process)
+        self.detect_in_subprocess = os.getenv("WINDOWS_YOLO_SUBPROCESS", "1") != "0"
+        self.int8_supported = False          # INT8 model only pays off with VNNI
+        self.calibration_frames = 100        # Frames sampled from the stream for INT8 calibration
+        self._calibration_blobs = []
+        self._quantization_started = False
+        self.inference_backend = 'ultralytics'
+        # 'onnxruntime' (default) or 'opencv' - the other ONNX backend is tried next
+        self.preferred_backend = os.getenv("WINDOWS_YOLO_BACKEND", "onnxruntime").strip().lower()
         self.inference_skip_frames = 12       # Skip 6 frames between inferences (every 6th frame)
         self.current_skip_count = 0
         self.model_retry_count = 0
@@ -123,6 +252,10 @@ class WindowsAIController:
         # Detection smoothing (avoid flicker) - optimized for lower memory
         self.detection_history = collections.deque(maxlen=6)  # Reduced from 8 to 6 for memory
         self.detection_keep_seconds = 0.8   # Increased to smooth over longer period
+        self._no_detections = (np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float32),
+                               np.empty(0, dtype=np.int32))
+        # Pre-rendered 'Person 0.xx' labels, blitted instead of rasterising text per box
+        self._label_tiles, self._label_baseline_y = self._build_label_tiles()
         self.crying_history = collections.deque(maxlen=6)     # Reduced for memory optimization
         
         # Connection status
@@ -149,18 +282,46 @@ class WindowsAIController:
         # Internet streaming variables
         self.streaming_enabled = tk.BooleanVar(value=False)
         self.streaming_port = tk.IntVar(value=8080)
+
+        # Plain-attribute mirrors of the Tk settings read every frame - worker threads
+        # never have to call into the Tcl interpreter
+        self._conf_f = self._mirror_tk_var(self.confidence_threshold, '_conf_f')
+        self._auto_b = self._mirror_tk_var(self.auto_tracking, '_auto_b')
+        self._largest_b = self._mirror_tk_var(self.track_largest_person, '_largest_b')
+        self._crying_b = self._mirror_tk_var(self.crying_detection_enabled, '_crying_b')
+        self._crying_conf_f = self._mirror_tk_var(self.crying_confidence_threshold, '_crying_conf_f')
+        self._streaming_b = self._mirror_tk_var(self.streaming_enabled, '_streaming_b')
         self.flask_app = None
         self.streaming_thread = None
         self.stream_frame = None
+        # Stream-sized copy of the latest frame, reused every frame
+        self.stream_width, self.stream_height = 640, 480
+        self._stream_buf = np.empty((self.stream_height, self.stream_width, 3), dtype=np.uint8)
         self.stream_lock = threading.Lock()
         # Streaming performance tuning - OPTIMIZED
         self.stream_fps = 15           # Increased for smoother display
         self.jpeg_quality = 50         # Lower quality for better performance  
         # Display throttling to avoid PhotoImage overload on main thread
-        self.display_fps = 25          # Increased for 1080p display (higher FPS)
+        self.display_fps = 15          # Preview rate - independent of inference FPS
         self._last_display_time = 0
         self.display_width = 960       # Display width for 1080p (half size for performance)
         self.display_height = 540      # Display height for 1080p (half size for performance)
+        # Double-buffered preview: vision thread fills the back buffer, Tk tick reads the front
+        self._preview_bufs = [np.empty((self.display_height, self.display_width, 3), dtype=np.uint8)
+                              for _ in range(2)]
+        self._preview_front = 0
+        self._preview_pending = False
+        self._preview_lock = threading.Lock()
+        # RGBA so PIL maps the array in place (frombuffer copies 3-channel RGB); the
+        # Image view is built once and always shows the buffer's current pixels
+        self._rgb_buf = np.empty((self.display_height, self.display_width, 4), dtype=np.uint8)
+        self._rgb_image = Image.frombuffer('RGBA', (self.display_width, self.display_height),
+                                           self._rgb_buf, 'raw', 'RGBA', 0, 1)
+        self._tk_photo = None
+
+        # Widget updates from worker threads, drained by one ~30 Hz main-thread pump
+        self._ui_q = queue.Queue()
+        self.ui_pump_interval_ms = 33
         
         # Memory management
         self.last_cleanup_time = 0
@@ -178,6 +339,16 @@ class WindowsAIController:
         self.load_yolo_model()
         self.init_face_detection()  # Initialize after GUI is ready
         
+    def _mirror_tk_var(self, var, attr):
+        """Keep ``self.<attr>`` in sync with a Tk variable, returns its current value"""
+        def _sync(*_):
+            try:
+                setattr(self, attr, var.get())
+            except tk.TclError:
+                pass  # Transient invalid value while a widget is being edited
+        var.trace_add('write', _sync)
+        return var.get()
+
     def setup_gui(self):
         """Setup the main GUI interface"""
         # Title bar
@@ -369,48 +540,48 @@ class WindowsAIController:
         
         # Start performance monitoring
         self.update_performance_display()
+
+        # Start the fixed-rate video preview and the UI update pump
+        self.root.after(int(1000 / self.display_fps), self._tk_preview_tick)
+        self.root.after(self.ui_pump_interval_ms, self._ui_pump)
         
     def load_yolo_model(self):
         """Load YOLO model in background with error recovery"""
         def load_model():
             try:
                 self.log("🧠 Loading optimized YOLO model...")
-                # Choose device: prefer CPU for stability on resource-constrained systems
-                try:
-                    import torch
-                    if torch.cuda.is_available() and torch.cuda.get_device_properties(0).total_memory > 2e9:
-                        self.model_device = 'cuda'
-                        self.log("🎯 Using CUDA (sufficient VRAM detected)")
-                    else:
-                        self.model_device = 'cpu'
-                        self.log("🎯 Using CPU (recommended for stability)")
-                except Exception:
-                    self.model_device = 'cpu'
-                    self.log("🎯 Using CPU (torch not available)")
 
-                # Load with optimizations for stability
-                self.model = YOLO('yolov8n.pt')  # Nano version for speed
-                
-                # Configure model for optimal performance
-                try:
-                    if hasattr(self.model, 'to'):
-                        self.model.to(self.model_device)
-                    # Set model to evaluation mode for consistency
-                    if hasattr(self.model.model, 'eval'):
-                        self.model.model.eval()
-                except Exception as e:
-                    self.log(f"⚠️ Model optimization warning: {e}")
-                    
+                # Prefer an ONNX backend on CPU - fused graph + SIMD kernels
+                self._replace_detector(None)
+                backends = ['onnxruntime', 'opencv']
+                if self.preferred_backend == 'opencv':
+                    backends.reverse()
+                for backend in backends:
+                    if backend == 'onnxruntime' and onnx_runtime_available():
+                        self._load_onnx_runtime_model()
+                    elif backend == 'opencv' and opencv_dnn_available():
+                        self._load_opencv_dnn_model()
+                    if self.onnx_detector is not None:
+                        break
+
+                if self.onnx_detector is None:
+                    self._load_torch_model()
+
+                # Compile the tracking kernel here instead of on the first tracked frame
+                pick_direction(np.zeros((1, 4), dtype=np.int32), np.ones(1, dtype=np.int32), True,
+                               640, 480, np.empty(2, dtype=np.float64))
+
                 self.model_loaded = True
                 self.model_crashed = False
                 self.model_retry_count = 0
-                self.root.after(0, lambda: self.model_label.config(text="Model: YOLOv8n Ready ✅", fg='lime'))
+                backend_name = {'onnxruntime': 'ONNX', 'opencv': 'OpenCV DNN'}.get(self.inference_backend, 'PyTorch')
+                self._post(self.model_label.config, text=f"Model: YOLOv8n {backend_name} Ready ✅", fg='lime')
                 self.log("✅ YOLO model loaded successfully")
                 
             except Exception as e:
                 self.model_retry_count += 1
                 self.model_crashed = True
-                self.root.after(0, lambda: self.model_label.config(text="Model: Error ❌", fg='red'))
+                self._post(self.model_label.config, text="Model: Error ❌", fg='red')
                 self.log(f"❌ Failed to load YOLO model (attempt {self.model_retry_count}): {e}")
                 
                 # Retry logic
@@ -420,6 +591,187 @@ class WindowsAIController:
                     load_model()  # Recursive retry
                 
         threading.Thread(target=load_model, daemon=True).start()
+
+    def _make_onnx_detector(self, model_path, backend):
+        """Build the detector for ``backend``, out of process when enabled"""
+        if self.detect_in_subprocess:
+            try:
+                detector = ProcessPersonDetector(model_path, backend=backend, input_size=self.inference_size)
+                self.log("🧵 Person detection running in a separate process")
+                return detector
+            except Exception as e:
+                self.log(f"⚠️ Detection process failed to start, running in-process: {e}")
+        detector_cls = OpenCVDnnPersonDetector if backend == 'opencv' else OnnxPersonDetector
+        return detector_cls(model_path, input_size=self.inference_size)
+
+    def _replace_detector(self, detector):
+        """Swap the active detector; a detection process is stopped once in-flight calls finish"""
+        old, self.onnx_detector = self.onnx_detector, detector
+        if old is not None and hasattr(old, 'close'):
+            threading.Timer(2.0, old.close).start()
+
+    def _ensure_onnx_model(self):
+        if not os.path.exists(self.onnx_model_path):
+            self.log("📦 Exporting YOLOv8n to ONNX (one-time)...")
+            export_onnx_model('yolov8n.pt', self.onnx_model_path, imgsz=self.inference_size)
+
+    def _load_onnx_runtime_model(self):
+        """ONNX Runtime CPU session (INT8 on VNNI CPUs once quantized)"""
+        try:
+            self._ensure_onnx_model()
+            self.int8_supported = cpu_supports_vnni()
+            if self.int8_supported and os.path.exists(self.int8_model_path):
+                self.onnx_detector = self._make_onnx_detector(self.int8_model_path, 'onnxruntime')
+                precision = 'INT8/VNNI'
+            else:
+                self.onnx_detector = self._make_onnx_detector(self.onnx_model_path, 'onnxruntime')
+                precision = 'FP32'
+            self.inference_backend = 'onnxruntime'
+            self.model_device = 'cpu'
+            self.log(f"🎯 Using ONNX Runtime CPU {precision} ({self.onnx_detector.input_size}px input)")
+        except Exception as e:
+            self.onnx_detector = None
+            self.log(f"⚠️ ONNX Runtime unavailable: {e}")
+
+    def _load_opencv_dnn_model(self):
+        """OpenCV DNN (OpenVINO backend when built in) - no onnxruntime or PyTorch at runtime"""
+        try:
+            self._ensure_onnx_model()
+            self.onnx_detector = self._make_onnx_detector(self.onnx_model_path, 'opencv')
+            self.int8_supported = False  # INT8 calibration targets ONNX Runtime only
+            self.inference_backend = 'opencv'
+            self.model_device = 'cpu'
+            self.log(f"🎯 Using OpenCV DNN ({self.onnx_detector.input_size}px input)")
+        except Exception as e:
+            self.onnx_detector = None
+            self.log(f"⚠️ OpenCV DNN unavailable: {e}")
+
+    def _load_torch_model(self):
+        """Load the ultralytics PyTorch model (fallback when ONNX Runtime is missing)"""
+        # Choose device: prefer CPU for stability on resource-constrained systems
+        try:
+            import torch
+            if torch.cuda.is_available() and torch.cuda.get_device_properties(0).total_memory > 2e9:
+                self.model_device = 'cuda'
+                self.log("🎯 Using CUDA (sufficient VRAM detected)")
+            else:
+                self.model_device = 'cpu'
+                self.log("🎯 Using CPU (recommended for stability)")
+        except Exception:
+            self.model_device = 'cpu'
+            self.log("🎯 Using CPU (torch not available)")
+
+        # Load with optimizations for stability (imported lazily - heavy PyTorch stack)
+        from ultralytics import YOLO
+        self.model = YOLO('yolov8n.pt')  # Nano version for speed
+        self.inference_backend = 'ultralytics'
+
+        # Configure model for optimal performance
+        try:
+            if hasattr(self.model, 'to'):
+                self.model.to(self.model_device)
+            # Set model to evaluation mode for consistency
+            if hasattr(self.model.model, 'eval'):
+                self.model.model.eval()
+        except Exception as e:
+            self.log(f"⚠️ Model optimization warning: {e}")
+
+    def _collect_calibration_frame(self, frame):
+        """Sample stream frames for INT8 calibration, then quantize in the background"""
+        if (self._quantization_started or self.inference_backend != 'onnxruntime'
+                or self.onnx_detector is None):  # detector is None mid-reload
+            return
+        if not self.int8_supported or os.path.exists(self.int8_model_path):
+            return
+
+        blob, _, _ = self.onnx_detector.preprocess(frame)
+        self._calibration_blobs.append(blob.copy())
+        if len(self._calibration_blobs) < self.calibration_frames:
+            return
+
+        self._quantization_started = True
+        blobs, self._calibration_blobs = self._calibration_blobs, []
+        input_name = self.onnx_detector.input_name
+
+        def quantize():
+            try:
+                self.log(f"⚙️ Quantizing YOLO to INT8 ({len(blobs)} calibration frames)...")
+                quantize_onnx_model(self.onnx_model_path, self.int8_model_path, input_name, blobs)
+                self._replace_detector(self._make_onnx_detector(self.int8_model_path, 'onnxruntime'))
+                self._post(self.model_label.config, text="Model: YOLOv8n INT8 Ready ✅", fg='lime')
+                self.log("✅ INT8 YOLO model active (VNNI)")
+            except Exception as e:
+                self.log(f"⚠️ INT8 quantization failed, staying on FP32: {e}")
+
+        threading.Thread(target=quantize, daemon=True).start()
+
+    def _detection_arrays(self, boxes, confs):
+        """Detector output → owned (int32 rects, scores, areas) arrays for one frame"""
+        count = len(confs)
+        rects = np.empty((count, 4), dtype=np.int32)
+        areas = np.empty(count, dtype=np.int32)
+        box_geometry(boxes, rects, areas)
+        return rects, np.array(confs, dtype=np.float32), areas
+
+    def _build_label_tiles(self):
+        """Render every 'Person 0.00'..'Person 1.00' label once, returns (tiles, baseline row)"""
+        font, scale, thickness = cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2
+        (text_w, text_h), baseline = cv2.getTextSize('Person 0.00', font, scale, thickness)
+        pad = thickness  # stroke overhang around the nominal text box
+        baseline_y = text_h + pad
+        tiles = []
+        for bucket in range(101):
+            tile = np.zeros((baseline_y + baseline + pad, text_w + 2 * pad, 3), dtype=np.uint8)
+            cv2.putText(tile, f'Person {bucket / 100:.2f}', (0, baseline_y), font, scale, (0, 255, 0), thickness)
+            tiles.append((tile, tile.any(axis=2)))
+        return tiles, baseline_y
+
+    def _draw_label(self, frame, x, y, conf):
+        """Blit the cached label tile with its baseline-left corner at (x, y), clipped to the frame"""
+        tile, mask = self._label_tiles[min(100, max(0, int(round(conf * 100))))]
+        top = y - self._label_baseline_y
+        tile_h, tile_w = mask.shape
+        y0, x0 = max(0, top), max(0, x)
+        y1, x1 = min(frame.shape[0], top + tile_h), min(frame.shape[1], x + tile_w)
+        if y0 >= y1 or x0 >= x1:
+            return
+        ty, tx = y0 - top, x0 - x
+        visible = mask[ty:ty + y1 - y0, tx:tx + x1 - x0]
+        frame[y0:y1, x0:x1][visible] = tile[ty:ty + y1 - y0, tx:tx + x1 - x0][visible]
+
+    def _run_person_detector_batch(self, frames, conf_threshold):
+        """Detect on several frames, one (boxes, confidences) result per frame"""
+        if self.onnx_detector is not None and len(frames) > 1:
+            return self.onnx_detector.detect_batch(frames, conf_threshold)
+        if len(frames) > 1:
+            return [self._run_person_detector(f, conf_threshold) for f in frames]
+        return [self._run_person_detector(frames[0], conf_threshold)]
+
+    def _run_person_detector(self, frame, conf_threshold):
+        """Run the loaded backend, returns (xyxy boxes in frame pixels, confidences)"""
+        if self.onnx_detector is not None:
+            return self.onnx_detector.detect(frame, conf_threshold)
+
+        # Resize frame before inference to reduce processing load - camera frames are always
+        # larger than the model input, so AREA (box filter) into the reused buffer
+        inference_frame = cv2.resize(frame, (self.inference_size, self.inference_size),
+                                     dst=self._inference_buf, interpolation=cv2.INTER_AREA)
+        results = self.model(inference_frame,
+                             classes=[0],  # Person class only
+                             conf=conf_threshold,
+                             imgsz=self.inference_size,
+                             device=self.model_device,
+                             verbose=False,
+                             half=False)  # Disable half precision for stability
+        if len(results) == 0 or len(results[0].boxes) == 0:
+            return np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        # Scale coordinates back to original frame size
+        orig_h, orig_w = frame.shape[:2]
+        boxes = results[0].boxes.xyxy.cpu().numpy()
+        boxes *= (orig_w / self.inference_size, orig_h / self.inference_size,
+                  orig_w / self.inference_size, orig_h / self.inference_size)
+        return boxes, results[0].boxes.conf.cpu().numpy()
     
     def init_face_detection(self):
         """Initialize face detection after GUI is ready"""
@@ -449,29 +801,93 @@ class WindowsAIController:
                 stream_url = f"{self.PI_BASE_URL}/video_feed"
                 self.log(f"🔄 Connecting to Pi stream: {stream_url}")
                 
-                # Configure OpenCV for low-latency MJPEG streaming
-                self.cap = cv2.VideoCapture(stream_url)
-                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimal buffering
+                # One persistent HTTP connection parsed by hand; OpenCV's reader is the fallback
+                try:
+                    self.cap = MjpegClient(stream_url)
+                except Exception as e:
+                    self.log(f"⚠️ MJPEG client failed ({e}), using OpenCV stream reader")
+                    # Configure OpenCV for low-latency MJPEG streaming
+                    self.cap = cv2.VideoCapture(stream_url)
+                    self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimal buffering
                 
                 if self.cap.isOpened():
                     self.tracking_active = True
                     self.pi_connected = True
                     
-                    self.root.after(0, lambda: self.connection_status.config(text="🟢 Pi Connected", fg='lime'))
+                    self._post(self.connection_status.config, text="🟢 Pi Connected", fg='lime')
                     self.log("✅ Connected to Pi camera → ESP32 system")
                     
-                    # Start video processing with AI
+                    # Start capture + video processing with AI
+                    threading.Thread(target=self._frame_grabber_loop, daemon=True).start()
                     threading.Thread(target=self.process_video_stream, daemon=True).start()
                 else:
-                    self.root.after(0, lambda: self.connection_status.config(text="❌ Stream Failed", fg='red'))
+                    self._post(self.connection_status.config, text="❌ Stream Failed", fg='red')
                     self.log("❌ Pi camera stream failed - check Pi server status")
                     
             except Exception as e:
-                self.root.after(0, lambda: self.connection_status.config(text="❌ Error", fg='red'))
+                self._post(self.connection_status.config, text="❌ Error", fg='red')
                 self.log(f"❌ Connection error: {e}")
                 
         threading.Thread(target=start_stream, daemon=True).start()
         
+    def _frame_grabber_loop(self):
+        """Capture thread: drain the Pi stream and queue the newest frames"""
+        with self.frame_lock:
+            self._grab_buffers = [None] * self.grab_slots
+            self._pending_slots.clear()
+            self._reading_slots = ()
+
+        while self.tracking_active and self.cap:
+            try:
+                cap = self.cap
+                if cap is None or not cap.grab():
+                    self.log("⚠️ Failed to read frame from Pi")
+                    time.sleep(0.1)
+                    continue
+
+                # Skip frames that are already fully buffered, without decoding them.
+                # Only MjpegClient can tell without blocking - a grab() that has to wait
+                # for the Pi would throw away the fresh frame we just took
+                buffered = getattr(cap, 'buffered', None)
+                if buffered is not None:
+                    for _ in range(self.max_grab_drain):
+                        if not buffered() or not cap.grab():
+                            break
+
+                # Never write into a queued slot or one being processed
+                with self.frame_lock:
+                    busy = set(self._pending_slots).union(self._reading_slots)
+                write_slot = next(i for i in range(self.grab_slots) if i not in busy)
+
+                ret, frame = cap.retrieve(self._grab_buffers[write_slot])
+                if not ret:
+                    continue
+
+                with self._frame_ready:
+                    # retrieve() reallocates on the first frame / resolution change
+                    self._grab_buffers[write_slot] = frame
+                    self._grab_times[write_slot] = time.perf_counter()
+                    self._pending_slots.append(write_slot)  # oldest drops when full
+                    self._frame_ready.notify_all()
+
+            except Exception as e:
+                self.log(f"❌ Frame grabber error: {e}")
+                time.sleep(0.1)
+
+    def _take_grabbed_frames(self, timeout=0.5):
+        """Claim every queued frame, returns [(frame, grab_time), ...] oldest → newest"""
+        with self._frame_ready:
+            if not self._frame_ready.wait_for(lambda: len(self._pending_slots) > 0, timeout):
+                return []
+            self._reading_slots = tuple(self._pending_slots)
+            self._pending_slots.clear()
+            return [(self._grab_buffers[i], self._grab_times[i]) for i in self._reading_slots]
+
+    def _release_grabbed_frames(self, keep=1):
+        """Hand all but the newest ``keep`` claimed slots back to the grabber"""
+        with self.frame_lock:
+            self._reading_slots = self._reading_slots[-keep:]
+
     def process_video_stream(self):
         """Process video stream with AI detection"""
         while self.tracking_active and self.cap:
@@ -479,78 +895,65 @@ class WindowsAIController:
                 # Progress any pending gentle turn sequences
                 self.process_turn_sequence()
 
-                ret, frame = self.cap.read()
-                
-                if not ret:
-                    self.log("⚠️ Failed to read frame from Pi")
-                    time.sleep(0.1)
+                # Newest frame last; older ones only exist if we fell behind the grabber
+                grabbed = self._take_grabbed_frames()
+                if not grabbed:
                     continue
+                frame = grabbed[-1][0]
                     
-                # Store current frame
+                # Store current frame (the grab slot stays ours until the next take)
                 with self.frame_lock:
-                    self.current_frame = frame.copy()
+                    self.current_frame = frame
+
+                # First connection on a VNNI CPU: gather frames for INT8 calibration
+                self._collect_calibration_frame(frame)
                 
                 # Run YOLO detection with optimized frame skipping and error handling
-                processed_frame = frame.copy()
-                detections = []
+                detections = self._no_detections
 
                 # Implement frame skipping for better performance
                 self.current_skip_count += 1
                 skip_inference = self.current_skip_count < self.inference_skip_frames
 
                 # Throttle inference to target FPS and resize for faster processing
-                now = time.time()
+                now = time.perf_counter()
                 min_interval = 1.0 / float(self.max_inference_fps)
                 time_based_skip = (now - self.last_inference_time) < min_interval
 
-                should_run_inference = (self.model_loaded and self.model and 
+                should_run_inference = (self.model_loaded and
+                                      (self.onnx_detector is not None or self.model is not None) and
                                       not self.model_crashed and 
                                       not skip_inference and 
                                       not time_based_skip)
 
+                if not should_run_inference and len(grabbed) > 1:
+                    # Backlog is only worth keeping when it can be batched
+                    grabbed = grabbed[-1:]
+                    self._release_grabbed_frames()
+
                 if should_run_inference:
                     try:
                         # Reset skip counter
                         self.current_skip_count = 0
                         
-                        # Resize frame before inference to reduce processing load
-                        inference_frame = cv2.resize(frame, (self.inference_size, self.inference_size))
-                        
-                        # Run inference with error handling
-                        results = self.model(inference_frame, 
-                                           classes=[0],  # Person class only
-                                           conf=self.confidence_threshold.get(), 
-                                           imgsz=self.inference_size, 
-                                           device=self.model_device, 
-                                           verbose=False,
-                                           half=False)  # Disable half precision for stability
+                        # Run inference with error handling - queued frames share one batch
+                        batch_results = self._run_person_detector_batch([f for f, _ in grabbed],
+                                                                        self._conf_f)
+                        self._release_grabbed_frames()
                         
                         self.last_inference_time = now
 
-                        if len(results) > 0 and len(results[0].boxes) > 0:
-                            # Scale coordinates back to original frame size
-                            orig_h, orig_w = frame.shape[:2]
-                            scale_x = orig_w / self.inference_size
-                            scale_y = orig_h / self.inference_size
-                            
-                            # Iterate detections
-                            boxes = results[0].boxes.xyxy.cpu().numpy()
-                            confidences = results[0].boxes.conf.cpu().numpy()
-                            for i, (box, conf) in enumerate(zip(boxes, confidences)):
-                                # Scale back to original coordinates
-                                x1, y1, x2, y2 = box.astype(int)
-                                x1 = int(x1 * scale_x)
-                                y1 = int(y1 * scale_y)
-                                x2 = int(x2 * scale_x)
-                                y2 = int(y2 * scale_y)
-                                detections.append({
-                                    'box': (x1, y1, x2, y2), 
-                                    'confidence': float(conf), 
-                                    'area': (x2 - x1) * (y2 - y1)
-                                })
-
-                        # Save detection snapshot for smoothing
-                        if detections:
+                        # Older frames in the batch only feed detection smoothing
+                        for (_, grab_time), (old_boxes, old_confs) in zip(grabbed[:-1], batch_results[:-1]):
+                            if len(old_confs):
+                                self.detection_history.append((grab_time, self._detection_arrays(old_boxes, old_confs)))
+
+                        # One pass over the whole result: rects, scores and areas as arrays
+                        boxes, confidences = batch_results[-1]
+                        if len(confidences):
+                            detections = self._detection_arrays(boxes, confidences)
+
+                            # Save detection snapshot for smoothing
                             self.detection_history.append((now, detections))
 
                     except Exception as e:
@@ -574,30 +977,22 @@ class WindowsAIController:
                         time.sleep(0.1)
 
                 # If we skipped inference or had no detections, try to reuse recent detections for smoothing
-                if not detections:
+                if not len(detections[1]):
                     # Find the most recent detection snapshot within keep_seconds
-                    chosen = None
                     for ts, dets in reversed(self.detection_history):
-                        if now - ts <= self.detection_keep_seconds and dets:
-                            chosen = dets
+                        if now - ts <= self.detection_keep_seconds:
+                            detections = dets  # snapshots are never modified, no copy needed
                             break
-                    if chosen:
-                        detections = chosen.copy()
-
-                # Draw detections (smoothed) onto frame
-                for d in detections:
-                    x1, y1, x2, y2 = d['box']
-                    conf = d.get('confidence', 0.0)
-                    cv2.rectangle(processed_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                    cv2.putText(processed_frame, f'Person {conf:.2f}', (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+                det_rects, det_scores, det_areas = detections
+                person_count = len(det_scores)
 
                 with self.mode_lock:
                     active_mode = self.operating_mode
 
                 # Auto tracking logic only in care companion mode
-                if active_mode == 'care_companion' and self.auto_tracking.get():
-                    if detections:
-                        if hasattr(self, 'search_active') and self.search_active:
+                if active_mode == 'care_companion' and self._auto_b:
+                    if person_count:
+                        if self.search_active:
                             self.search_active = False
                             if self.turn_sequence_active():
                                 self.pending_turn_sequence = None
@@ -606,40 +1001,51 @@ class WindowsAIController:
                             self.log("🎯 Person found! Stopping search, starting tracking")
                             time.sleep(0.2)
 
-                        self.process_auto_tracking(detections, processed_frame.shape)
+                        self.process_auto_tracking(det_rects, det_areas, frame.shape)
                     else:
                         self.process_search_mode()
                 else:
-                    if hasattr(self, 'search_active') and self.search_active:
+                    if self.search_active:
                         self.search_active = False
                         self.update_search_overlay("", "")
 
-                self._handle_mode_logic(active_mode, detections, now)
+                self._handle_mode_logic(active_mode, person_count, now)
 
                 # Crying detection only makes sense in care companion mode
-                if active_mode == 'care_companion' and self.crying_detection_enabled.get() and detections:
+                if active_mode == 'care_companion' and self._crying_b and person_count:
                     try:
-                        target = max(detections, key=lambda d: d.get('area', 0))
-                        self.detect_crying(frame, target['box'], processed_frame)
+                        target_box = tuple(det_rects[det_areas.argmax()].tolist())
+                        self.detect_crying(frame, target_box, frame)
                     except Exception as e:
                         self.log(f"⚠️ Crying detect call failed: {e}")
                 elif active_mode != 'care_companion' and self.crying_detected:
                     self.crying_detected = False
-                    self.root.after(0, lambda: self.crying_status.config(text="😊 No Crying", fg='lime'))
+                    self._post(self.crying_status.config, text="😊 No Crying", fg='lime')
                 
+                # Draw detections (smoothed) straight onto the capture buffer - crying
+                # analysis above has already read the clean pixels
+                rectangle, draw_label = cv2.rectangle, self._draw_label
+                for (x1, y1, x2, y2), conf in zip(det_rects.tolist(), det_scores.tolist()):
+                    rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                    draw_label(frame, x1, y1 - 10, conf)
+
                 # Update display
-                self.update_video_display(processed_frame)
-                self.update_detection_count(len(detections))
+                self.update_video_display(frame)
+                self.update_detection_count(person_count)
 
-                # Update stream frame for internet streaming
-                try:
-                    if self.stream_lock.acquire(timeout=0.05):
-                        try:
-                            self.stream_frame = processed_frame.copy()
-                        finally:
-                            self.stream_lock.release()
-                except Exception:
-                    pass
+                # Update stream frame for internet streaming - the grabber reuses this
+                # buffer, so only pay for a (stream-sized) copy when someone is watching
+                if self._streaming_b:
+                    try:
+                        if self.stream_lock.acquire(timeout=0.05):
+                            try:
+                                cv2.resize(frame, (self.stream_width, self.stream_height),
+                                           dst=self._stream_buf, interpolation=cv2.INTER_AREA)
+                                self.stream_frame = self._stream_buf
+                            finally:
+                                self.stream_lock.release()
+                    except Exception:
+                        pass
                 
                 # Update FPS
                 self.fps_counter += 1
@@ -648,7 +1054,7 @@ class WindowsAIController:
                 self.process_turn_sequence()
                 
                 # Memory cleanup every 10 seconds
-                now_cleanup = time.time()
+                now_cleanup = time.perf_counter()
                 if now_cleanup - self.last_cleanup_time > self.cleanup_interval:
                     self.cleanup_memory()
                     self.last_cleanup_time = now_cleanup
@@ -661,7 +1067,7 @@ class WindowsAIController:
         """FIXED crying detection with improved stability"""
         try:
             # Throttle crying checks to reduce CPU
-            now = time.time()
+            now = time.perf_counter()
             if now - self._last_crying_check_time < self.crying_check_interval:
                 return
             self._last_crying_check_time = now
@@ -697,7 +1103,7 @@ class WindowsAIController:
             
             if len(recent_scores) >= 3:  # Need at least 3 samples
                 avg_score = sum(recent_scores) / len(recent_scores)
-                crying_detected = avg_score > self.crying_confidence_threshold.get()
+                crying_detected = avg_score > self._crying_conf_f
                 
                 if crying_detected and not self.crying_detected:
                     # New crying detection
@@ -710,7 +1116,7 @@ class WindowsAIController:
                 elif not crying_detected and self.crying_detected:
                     # Crying stopped
                     self.crying_detected = False
-                    self.root.after(0, lambda: self.crying_status.config(text="😊 No Crying", fg='lime'))
+                    self._post(self.crying_status.config, text="😊 No Crying", fg='lime')
                     self.log("😊 Crying detection cleared")
                     
         except Exception as e:
@@ -845,7 +1251,7 @@ class WindowsAIController:
             if brightness > 120:  # Bright reflective areas (tears)
                 crying_score += 0.3
             
-            return crying_score > self.crying_confidence_threshold.get()
+            return crying_score > self._crying_conf_f
             
         except Exception as e:
             self.log(f"⚠️ OpenCV crying detection error: {e}")
@@ -864,7 +1270,7 @@ class WindowsAIController:
             self.last_crying_alert = current_time
             
             # Update GUI
-            self.root.after(0, lambda: self.crying_status.config(text="😢 CRYING!", fg='red'))
+            self._post(self.crying_status.config, text="😢 CRYING!", fg='red')
             
             # Log alert
             self.log("🚨 CRYING DETECTED - Alert triggered!")
@@ -911,34 +1317,20 @@ class WindowsAIController:
             # Visual-only alert as last resort
             self.log("🔊 AUDIO ALERT: CRYING DETECTED!")
 
-    def process_auto_tracking(self, detections, frame_shape):
+    def process_auto_tracking(self, rects, areas, frame_shape):
         """Process automatic person tracking with balanced movement"""
-        if not detections:
+        if not len(areas):
             return
 
-        current_time = time.time()
+        current_time = time.perf_counter()
 
         # Slow cooldown to match search rotation speed and prevent overshooting
         gentle_cooldown = 0.5  # 500ms between auto commands (same as search rotation speed)
         if current_time - self.last_command_time < gentle_cooldown:
             return
 
-        # Find the target person (largest if enabled, otherwise first)
-        if self.track_largest_person.get():
-            target = max(detections, key=lambda d: d['area'])
-        else:
-            target = detections[0]
-
-        x1, y1, x2, y2 = target['box']
-        center_x = (x1 + x2) / 2
-        frame_width, frame_height = frame_shape[1], frame_shape[0]
-
         # Calculate movement command with refined thresholds
-        command = self.calculate_movement_command(center_x, (y1 + y2) / 2, target['area'],
-                                                  frame_width, frame_height)
-
-        if not hasattr(self, 'last_auto_command'):
-            self.last_auto_command = 'S'
+        command = self.calculate_movement_command(rects, areas, frame_shape[1], frame_shape[0])
 
         if command in ['L', 'R']:
             if command != self.last_auto_command or not self.turn_sequence_active():
@@ -961,104 +1353,59 @@ class WindowsAIController:
             
     def process_search_mode(self):
         """Fast 360-degree search with short scans and 2s pauses between turns"""
-        current_time = time.time()
-        
-        # Initialize search mode tracking
-        if not hasattr(self, 'search_active'):
-            self.search_active = False
-            self.search_start_time = 0
-            self.search_last_command_time = 0
-            self.search_phase = 'scan'
-            self.total_micro_turns = 0
-            self.target_micro_turns = 36  # 36 × 10° ≈ 360°
-            self.current_cycle = 1
+        current_time = time.perf_counter()
 
         # Start search if not already active
         if not self.search_active:
             self.search_active = True
             self.search_start_time = current_time
             self.search_last_command_time = current_time
-            self.search_phase = 'scan'
+            self._search_phase_idx = SEARCH_SCAN
             self.total_micro_turns = 0
             self.current_cycle = 1
             self.log("🔍 Starting fast 360° search (36 micro-turns × 10°)")
             # Update GUI overlay
             self.update_search_overlay("Starting Fast Search", "36 micro-turn cycle")
 
+        phase = self._search_phase_idx
+        duration, command, next_phase, overlay = self.SEARCH_PHASES[phase]
+        elapsed = current_time - self.search_last_command_time
+
         # Update GUI overlay with current status
-        progress = (self.total_micro_turns / self.target_micro_turns) * 100 if self.target_micro_turns else 0
-        cycle_info = f"Cycle {self.current_cycle} | Turn {self.total_micro_turns}/{self.target_micro_turns} ({progress:.1f}%)"
-
-        # Phase-based search with crisp pauses
-        if self.search_phase == 'scan':
-            # Quick scan before turning
-            scan_duration = 0.5
-            elapsed = current_time - self.search_last_command_time
-            self.update_search_overlay(f"🔍 Scanning ({elapsed:.2f}s/0.50s)", cycle_info)
-
-            if elapsed >= scan_duration:
-                self.search_phase = 'pre_turn'
-                self.search_last_command_time = current_time
-                self.log(f"🔍 Scan complete → micro-turn {self.total_micro_turns + 1}")
+        if phase == SEARCH_CYCLE_REST:
+            cycle_info = f"Completed Cycle {self.current_cycle}"
+        else:
+            progress = (self.total_micro_turns / self.target_micro_turns) * 100 if self.target_micro_turns else 0
+            cycle_info = f"Cycle {self.current_cycle} | Turn {self.total_micro_turns}/{self.target_micro_turns} ({progress:.1f}%)"
 
-        elif self.search_phase == 'pre_turn':
-            # Brief stabilization before turn
-            pre_turn_duration = 0.05
-            elapsed = current_time - self.search_last_command_time
-            self.update_search_overlay(f"⚙️ Stabilising ({elapsed:.2f}s/0.05s)", cycle_info)
-
-            if elapsed >= pre_turn_duration:
-                self.search_phase = 'micro_turn'
-                self.search_last_command_time = current_time
-
-        elif self.search_phase == 'micro_turn':
-            # Quick micro-turn with slightly longer hold for better coverage
-            micro_turn_duration = 0.12
-            elapsed = current_time - self.search_last_command_time
-            self.update_search_overlay(f"↻ Turning ({elapsed:.2f}s/0.12s)", cycle_info)
-
-            if elapsed >= micro_turn_duration:
-                self.start_turn_sequence('R', auto=True, source='search')
-                self.search_phase = 'stop_spam'
-                self.search_last_command_time = current_time
-
-        elif self.search_phase == 'stop_spam':
-            stops_sent, total_stops = self.get_turn_sequence_progress()
+        if duration is None:
+            # Stop burst after the micro-turn - done when the turn sequence finishes
             if self.turn_sequence_active():
-                total_display = total_stops if total_stops else 3
-                self.update_search_overlay(f"🛑 Settling ({stops_sent}/{total_display})", cycle_info)
+                stops_sent, total_stops = self.get_turn_sequence_progress()
+                self.update_search_overlay(overlay.format(stops_sent=stops_sent, total_stops=total_stops or 3),
+                                           cycle_info)
+                phase_done = False
             else:
+                phase_done = True
+        else:
+            self.update_search_overlay(overlay.format(elapsed=elapsed, remaining=max(0.0, duration - elapsed)),
+                                       cycle_info)
+            phase_done = elapsed >= duration
+
+        if phase_done:
+            if command:
+                self.start_turn_sequence(command, auto=True, source='search')
+            if phase == SEARCH_SCAN:
+                self.log(f"🔍 Scan complete → micro-turn {self.total_micro_turns + 1}")
+            elif phase == SEARCH_STOP_SPAM:
                 self.total_micro_turns += 1
-                self.search_phase = 'long_pause'
-                self.search_last_command_time = current_time
-
-        elif self.search_phase == 'long_pause':
-            # 250ms pause between turns
-            long_pause_duration = 0.25
-            elapsed = current_time - self.search_last_command_time
-            remaining = max(0.0, long_pause_duration - elapsed)
-            self.update_search_overlay(f"⏸️ Pause {remaining:.2f}s", cycle_info)
-
-            if elapsed >= long_pause_duration:
-                if self.total_micro_turns >= self.target_micro_turns:
-                    self.search_phase = 'cycle_rest'
-                    self.search_last_command_time = current_time
-                else:
-                    self.search_phase = 'scan'
-                    self.search_last_command_time = current_time
-
-        elif self.search_phase == 'cycle_rest':
-            # Short rest between cycles
-            cycle_rest_duration = 0.25
-            elapsed = current_time - self.search_last_command_time
-            remaining = max(0.0, cycle_rest_duration - elapsed)
-            self.update_search_overlay(f"😴 Rest {remaining:.2f}s", f"Completed Cycle {self.current_cycle}")
-
-            if elapsed >= cycle_rest_duration:
+            elif phase == SEARCH_LONG_PAUSE and self.total_micro_turns >= self.target_micro_turns:
+                next_phase = SEARCH_CYCLE_REST
+            elif phase == SEARCH_CYCLE_REST:
                 self.total_micro_turns = 0
                 self.current_cycle += 1
-                self.search_phase = 'scan'
-                self.search_last_command_time = current_time
+            self._search_phase_idx = next_phase
+            self.search_last_command_time = current_time
 
         # Timeout protection
         if current_time - self.search_start_time > 240:  # 4 minute timeout
@@ -1067,44 +1414,16 @@ class WindowsAIController:
             self.search_active = False
             self.update_search_overlay("⏹️ Search Stopped", "Timeout reached")
             
-    def calculate_movement_command(self, center_x, center_y, area, frame_width, frame_height):
+    def calculate_movement_command(self, rects, areas, frame_width, frame_height):
         """Calculate robot movement based on person position for smooth tracking"""
-        frame_center_x = frame_width / 2
-        offset_x = center_x - frame_center_x
-        total_pixels = frame_width * frame_height
-
-        # Thresholds tuned for smoother behaviour
-        x_threshold = frame_width * 0.18          # 18% dead zone left/right
-        min_area = total_pixels * 0.03           # If person is very small, push forward
-        ideal_area = total_pixels * 0.22         # Comfortable following distance (move until here)
-        max_area = total_pixels * 0.38           # Too close, stop
-
-        offset_percent = abs(offset_x) / (frame_width / 2) * 100
-        area_percent = (area / total_pixels) * 100 if total_pixels else 0
-
-        # Distance control
-        if area < min_area:
-            self.log(f"🚶 Closing distance (size {area_percent:.1f}%)")
-            return 'F'
-        if area > max_area:
-            self.log("🛑 Person extremely close - holding position")
-            return 'S'
-
-        # Lateral alignment only when significantly off-centre
-        if offset_x > x_threshold and offset_percent > 18:
-            self.log(f"↪️ Adjusting right ({offset_percent:.1f}% offset)")
-            return 'R'
-        if offset_x < -x_threshold and offset_percent > 18:
-            self.log(f"↩️ Adjusting left ({offset_percent:.1f}% offset)")
-            return 'L'
-
-        # Maintain forward drift until ideal size reached
-        if area < ideal_area:
-            self.log(f"🚶 Continuing forward (target {ideal_area/total_pixels*100:.1f}% area)")
-            return 'F'
-
-        # Otherwise stay put
-        return 'S'
+        # Target pick + thresholds run in the compiled kernel (see detection_kernels)
+        decision = pick_direction(rects, areas, self._largest_b, frame_width, frame_height,
+                                  self._track_stats)
+        command, message = self.TRACK_DECISIONS[decision]
+        if message:
+            offset_percent, area_percent = self._track_stats
+            self.log(message.format(offset=offset_percent, area=area_percent))
+        return command
 
     def turn_sequence_active(self):
         return self.pending_turn_sequence is not None
@@ -1152,7 +1471,7 @@ class WindowsAIController:
             'auto': auto,
             'steps': steps,
             'step_index': 0,
-            'start_time': time.time(),
+            'start_time': time.perf_counter(),
             'active': True,
             'stops_sent': 0,
             'total_stops': total_stops
@@ -1166,7 +1485,7 @@ class WindowsAIController:
             return
 
         sequence = self.pending_turn_sequence
-        now = time.time()
+        now = time.perf_counter()
         elapsed = now - sequence['start_time']
 
         while sequence['step_index'] < len(sequence['steps']):
@@ -1184,7 +1503,7 @@ class WindowsAIController:
                 }
 
             sequence['step_index'] += 1
-            now = time.time()
+            now = time.perf_counter()
             elapsed = now - sequence['start_time']
 
         if sequence['step_index'] >= len(sequence['steps']):
@@ -1194,13 +1513,13 @@ class WindowsAIController:
         """Send movement command to Pi → ESP32 (GPIO1/3 UART0)"""
         try:
             # Rate limiting - Different speeds for tracking vs search
-            current_time = time.time()
+            current_time = time.perf_counter()
 
             # Unified slow timing for both tracking and search to prevent overshooting
-            if auto and hasattr(self, 'search_active') and not self.search_active:
+            if auto and not self.search_active:
                 # In tracking mode - use same slow speed as search rotation
                 min_interval = 0.5  # 500ms between tracking commands (same as search cycle)
-            elif auto and hasattr(self, 'search_active') and self.search_active:
+            elif auto and self.search_active:
                 # In search mode - use search-specific timing
                 min_interval = 0.02  # 20ms for search stop spam
             else:
@@ -1215,20 +1534,77 @@ class WindowsAIController:
                 self.log(f"❌ Invalid ESP32 command: {command}. Valid: F/B/L/R/S")
                 return
                 
-            url = f"{self.PI_BASE_URL}/move"
-            data = {"direction": command}
-            
+            self.last_command_time = current_time
+            self._enqueue_command(command, auto, force)
+
+        except Exception as e:
+            self.log(f"❌ Command {command} error: {e}")
+
+    def _enqueue_command(self, command, auto, force=False):
+        """Hand a command to the worker, replacing any unsent one (latest wins)"""
+        if (not force and command == self._last_sent_cmd
+                and time.perf_counter() - self._last_sent_time < self.command_cooldown):
+            return  # Robot was just told this - don't repeat it
+        while True:
+            try:
+                self._cmd_q.put_nowait((command, auto))
+                return
+            except queue.Full:
+                try:
+                    self._cmd_q.get_nowait()  # Stale command never went out - drop it
+                except queue.Empty:
+                    pass
+
+    def _cmd_worker(self):
+        """Background sender: pops queued commands and posts them to the Pi"""
+        while True:
+            command, auto = self._cmd_q.get()
+            self._post_command(command, auto)
+
+    def _move_request(self, path, body, headers):
+        """POST on the worker's persistent connection to the Pi, returns (status, response bytes)"""
+        if self._cmd_conn is None or self._cmd_conn_url != self.PI_BASE_URL:
+            if self._cmd_conn is not None:
+                self._cmd_conn.close()
+            parts = urlsplit(self.PI_BASE_URL)
+            # http.client sets TCP_NODELAY itself when it connects
+            self._cmd_conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=0.5)
+            self._cmd_conn_url = self.PI_BASE_URL
+
+        try:
+            self._cmd_conn.request('POST', path, body=body, headers=headers)
+            response = self._cmd_conn.getresponse()
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            # Pi dropped the idle keep-alive connection - reconnect once and resend
+            self._cmd_conn.close()
+            self._cmd_conn.request('POST', path, body=body, headers=headers)
+            response = self._cmd_conn.getresponse()
+        return response.status, response.read()
+
+    def _post_command(self, command, auto):
+        """Blocking HTTP POST of one movement command (runs on the command worker)"""
+        try:
             self.log(f"📤 Windows → Pi → ESP32: {command}")
+            self._last_sent_cmd = command
+            self._last_sent_time = time.perf_counter()
             
-            response = requests.post(url, json=data, timeout=3)
+            if self._move_query_supported:
+                # Direction as a query param - no JSON body to encode or parse
+                status, data = self._move_request(f"/move?d={command}", b'', self._cmd_query_headers)
+                if not self._move_query_probed:
+                    self._move_query_probed = True
+                    if status != 200:
+                        # Older Pi servers choke on the empty body (400 or 500) - use JSON from now on
+                        self._move_query_supported = False
+            if not self._move_query_supported:
+                status, data = self._move_request('/move', MOVE_JSON_BODIES[command], self._cmd_headers)
             
-            if response.status_code == 200:
+            if status == 200:
                 self.commands_sent += 1
-                self.last_command_time = current_time
                 
                 # Parse Pi server response for ESP32 status
                 try:
-                    result = response.json()
+                    result = json.loads(data)
                     uart_status = result.get('uart_status', 'unknown')
                     message = result.get('message', '')
                     prefix = "🤖 Auto" if auto else "🎮 Manual"
@@ -1244,24 +1620,21 @@ class WindowsAIController:
                     self.log(f"{prefix} command: {command} → Pi (response parse error: {e})")
                     
             else:
-                self.log(f"❌ Command {command} failed: HTTP {response.status_code}")
+                self.log(f"❌ Command {command} failed: HTTP {status}")
                 try:
-                    error_data = response.json()
-                    error_msg = error_data.get('message', 'Unknown error')
+                    error_msg = json.loads(data).get('message', 'Unknown error')
                     self.log(f"   💬 Pi error: {error_msg}")
-                except:
-                    self.log(f"   💬 Raw response: {response.text[:100]}")
-                try:
-                    error_msg = response.json().get('message', 'Unknown error')
-                    self.log(f"   Error details: {error_msg}")
-                except:
-                    self.log(f"   Response: {response.text[:100]}")
+                except Exception:
+                    self.log(f"   💬 Raw response: {data[:100].decode(errors='replace')}")
                 
-        except requests.ConnectionError:
+        except socket.timeout:
+            self._cmd_conn.close()  # a late reply would desync the next request
+            self.log(f"⏱️ Command {command} timeout (Pi slow/busy)")
+        except (OSError, http.client.HTTPException):
+            if self._cmd_conn is not None:
+                self._cmd_conn.close()
             self.log(f"❌ Command {command} failed: Cannot connect to Pi at {self.PI_BASE_URL}")
             self.log(f"   Check: 1) Pi running? 2) Correct IP? 3) Pi server started?")
-        except requests.Timeout:
-            self.log(f"⏱️ Command {command} timeout (Pi slow/busy)")
         except Exception as e:
             self.log(f"❌ Command {command} error: {e}")
 
@@ -1333,9 +1706,8 @@ class WindowsAIController:
             if self.auto_tracking.get():
                 self.auto_tracking.set(False)
                 self.log('🤖 Auto tracking paused for new mode')
-            if hasattr(self, 'search_active'):
-                self.search_active = False
-                self.update_search_overlay('', '')
+            self.search_active = False
+            self.update_search_overlay('', '')
             self.send_command('S', auto=True, force=True)
 
         if mode == 'watchdog':
@@ -1398,7 +1770,7 @@ class WindowsAIController:
             return
 
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.PI_BASE_URL}/assistant/mode",
                 json=payload,
                 timeout=5,
@@ -1407,16 +1779,16 @@ class WindowsAIController:
         except Exception as exc:
             self.log(f"⚠️ Mode sync failed: {exc}")
 
-    def _handle_mode_logic(self, mode: str, detections, timestamp: float) -> None:
+    def _handle_mode_logic(self, mode: str, person_count: int, timestamp: float) -> None:
         if mode == 'watchdog':
-            self._handle_watchdog_mode(detections, timestamp)
+            self._handle_watchdog_mode(person_count, timestamp)
         elif mode == 'edumate':
-            self._handle_edumate_mode(detections, timestamp)
+            self._handle_edumate_mode(person_count, timestamp)
         else:
             self._stop_watchdog_alarm()
 
-    def _handle_watchdog_mode(self, detections, timestamp: float) -> None:
-        person_present = bool(detections)
+    def _handle_watchdog_mode(self, person_count: int, timestamp: float) -> None:
+        person_present = person_count > 0
 
         if person_present and not self._watchdog_person_present:
             self._last_watchdog_alert = timestamp
@@ -1448,8 +1820,8 @@ class WindowsAIController:
 
         self._watchdog_person_present = person_present
 
-    def _handle_edumate_mode(self, detections, timestamp: float) -> None:
-        learner_present = bool(detections)
+    def _handle_edumate_mode(self, person_count: int, timestamp: float) -> None:
+        learner_present = person_count > 0
         with self.mode_lock:
             self.mode_metadata['learner_present'] = learner_present
             self.mode_metadata['last_check_at'] = datetime.utcnow().isoformat()
@@ -1500,7 +1872,7 @@ class WindowsAIController:
     def silence_watchdog_alarm(self) -> None:
         self._stop_watchdog_alarm()
         self._watchdog_person_present = False
-        self._last_watchdog_alert = time.time()
+        self._last_watchdog_alert = time.perf_counter()
         self.register_manual_alert(
             'Watchdog alarm silenced',
             'Alarm muted from dashboard.',
@@ -1519,7 +1891,7 @@ class WindowsAIController:
             return False
 
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.PI_BASE_URL}/assistant/message",
                 json={
                     'text': text,
@@ -1546,7 +1918,7 @@ class WindowsAIController:
                 url = f"{pi_url}/status"
                 self.log(f"📡 Checking status endpoint: {url}")
                 
-                response = requests.get(url, timeout=5)
+                response = self._http.get(url, timeout=5)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -1577,15 +1949,17 @@ class WindowsAIController:
                     def show_result():
                         messagebox.showinfo("Pi Connection Test", status_msg)
                         
-                    self.root.after(0, show_result)
+                    self._post(show_result)
                     self.log("✅ Pi connection test successful")
                     
                     # Test video feed
                     try:
                         video_url = f"{pi_url}/video_feed"
                         self.log(f"📹 Testing video feed: {video_url}")
-                        video_response = requests.get(video_url, timeout=3, stream=True)
-                        if video_response.status_code == 200:
+                        # HEAD proves the route is up without opening an endless MJPEG body;
+                        # 405 means the server only rejects the method, so it is reachable too
+                        video_response = self._http.head(video_url, timeout=1, allow_redirects=False)
+                        if video_response.status_code in (200, 405):
                             self.log("✅ Video feed accessible")
                         else:
                             self.log(f"⚠️ Video feed issue: HTTP {video_response.status_code}")
@@ -1601,7 +1975,7 @@ class WindowsAIController:
                     error_msg += "2. Correct IP address?\n"
                     error_msg += "3. Network connectivity?"
                     
-                    self.root.after(0, lambda: messagebox.showerror("Connection Failed", error_msg))
+                    self._post(messagebox.showerror, "Connection Failed", error_msg)
                     self.log(f"❌ Pi connection failed: HTTP {response.status_code}")
                     
             except requests.ConnectionError:
@@ -1613,7 +1987,7 @@ class WindowsAIController:
                 error_msg += "3. Pi and Windows on same network?\n\n"
                 error_msg += "4. Pi firewall blocking port 5000?"
                 
-                self.root.after(0, lambda: messagebox.showerror("Connection Error", error_msg))
+                self._post(messagebox.showerror, "Connection Error", error_msg)
                 self.log(f"❌ Connection error: Cannot reach Pi at {pi_url}")
                 
             except requests.Timeout:
@@ -1621,14 +1995,14 @@ class WindowsAIController:
                 error_msg += f"Pi is reachable but slow to respond.\n"
                 error_msg += f"Try again or check Pi performance."
                 
-                self.root.after(0, lambda: messagebox.showerror("Timeout Error", error_msg))
+                self._post(messagebox.showerror, "Timeout Error", error_msg)
                 self.log(f"⏱️ Pi connection timeout")
                 
             except Exception as e:
                 error_msg = f"❌ Connection Error\n\n{str(e)}\n\n"
                 error_msg += "Check network and Pi server status."
                 
-                self.root.after(0, lambda: messagebox.showerror("Connection Error", error_msg))
+                self._post(messagebox.showerror, "Connection Error", error_msg)
                 self.log(f"❌ Connection error: {e}")
                 
         threading.Thread(target=test, daemon=True).start()
@@ -1640,8 +2014,7 @@ class WindowsAIController:
         else:
             self.log("🎯 Auto tracking disabled")
             # Stop search mode and hide overlay
-            if hasattr(self, 'search_active'):
-                self.search_active = False
+            self.search_active = False
             self.update_search_overlay("", "")
             self.send_command('S')  # Stop robot
     
@@ -1755,13 +2128,13 @@ class WindowsAIController:
                     self.flask_app.run(host='0.0.0.0', port=port, threaded=True, use_reloader=False)
                 except Exception as e:
                     self.log(f"❌ Streaming server error: {e}")
-                    self.root.after(0, self.stop_internet_streaming)
+                    self._post(self.stop_internet_streaming)
             
             self.streaming_thread = threading.Thread(target=run_flask, daemon=True)
             self.streaming_thread.start()
             
             # Update GUI
-            self.root.after(0, lambda: self.stream_status.config(text="🟢 Stream Online", fg='lime'))
+            self._post(self.stream_status.config, text="🟢 Stream Online", fg='lime')
             
             # Get local IP for URL display
             local_ip = self.get_local_ip()
@@ -1773,7 +2146,7 @@ class WindowsAIController:
         except Exception as e:
             self.log(f"❌ Failed to start streaming: {e}")
             self.streaming_enabled.set(False)
-            self.root.after(0, lambda: self.stream_status.config(text="❌ Stream Error", fg='red'))
+            self._post(self.stream_status.config, text="❌ Stream Error", fg='red')
     
     def stop_internet_streaming(self):
         """Stop internet streaming"""
@@ -1784,7 +2157,7 @@ class WindowsAIController:
                 # Flask doesn't have a clean shutdown method, so we'll let the thread finish
                 self.flask_app = None
             
-            self.root.after(0, lambda: self.stream_status.config(text="⚫ Stream Offline", fg='red'))
+            self._post(self.stream_status.config, text="⚫ Stream Offline", fg='red')
             self.log("🛑 Internet streaming stopped")
             
         except Exception as e:
@@ -1794,7 +2167,8 @@ class WindowsAIController:
         """Generate frames for Flask streaming"""
         target_interval = 1.0 / float(self.stream_fps)
         last_sent = time.monotonic()
-        while self.streaming_enabled.get():
+        client_buf = np.empty_like(self._stream_buf)  # this client's snapshot, reused
+        while self._streaming_b:
             try:
                 start = time.monotonic()
                 # Copy the latest frame with minimal locking
@@ -1802,7 +2176,8 @@ class WindowsAIController:
                 if self.stream_lock.acquire(timeout=0.05):
                     try:
                         if self.stream_frame is not None:
-                            frame = self.stream_frame.copy()
+                            np.copyto(client_buf, self.stream_frame)
+                            frame = client_buf
                     finally:
                         self.stream_lock.release()
 
@@ -1814,7 +2189,7 @@ class WindowsAIController:
 
                 # Resize to a reasonable streaming size to reduce payload
                 try:
-                    stream_h, stream_w = 480, 640
+                    stream_h, stream_w = self.stream_height, self.stream_width
                     if frame.shape[0] != stream_h or frame.shape[1] != stream_w:
                         frame = cv2.resize(frame, (stream_w, stream_h), interpolation=cv2.INTER_LINEAR)
                 except Exception:
@@ -1871,8 +2246,19 @@ class WindowsAIController:
             messagebox.showwarning("Stream Offline", "Enable internet streaming first!")
     def update_search_overlay(self, status_text, progress_text):
         """Update the search overlay display"""
+        # Called every frame while searching: skip repeats, and refresh changing text
+        # no faster than the preview (show/hide always goes through)
+        state = (self.search_active, status_text, progress_text)
+        now = time.perf_counter()
+        if state == self._search_overlay_state:
+            return
+        if state[0] == self._search_overlay_state[0] and now - self._search_overlay_time < 1.0 / self.display_fps:
+            return
+        self._search_overlay_state = state
+        self._search_overlay_time = now
+
         def _update():
-            if hasattr(self, 'search_active') and self.search_active:
+            if self.search_active:
                 # Show overlay
                 self.search_overlay.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
                 self.search_status_label.config(text=status_text)
@@ -1881,13 +2267,13 @@ class WindowsAIController:
                 # Hide overlay
                 self.search_overlay.place_forget()
         
-        self.root.after(0, _update)
+        self._post(_update)
 
     def update_detection_count(self, count):
         """Update detection counter"""
         # Store last detections for streaming status
         self.last_detections = [1] * count  # Simple way to store count
-        self.root.after(0, lambda: self.detection_label.config(text=f"Detections: {count}"))
+        self._post(self.detection_label.config, text=f"Detections: {count}")
 
     def stop_tracking(self):
         """Stop video tracking"""
@@ -1899,6 +2285,8 @@ class WindowsAIController:
             self.cap = None
             
         self.connection_status.config(text="⚫ Disconnected", fg='red')
+        with self._preview_lock:
+            self._preview_pending = False
         self.video_canvas.config(image='', text="📹 Disconnected")
         self.video_canvas.image = None
         
@@ -1906,62 +2294,105 @@ class WindowsAIController:
         self.log("🛑 Tracking stopped")
         
     def update_video_display(self, frame):
-        """Update video display with processed frame"""
+        """Hand the processed frame to the Tk preview (scaled into the back buffer)"""
         try:
-            # Throttle GUI display updates to reduce main-thread load
-            now = time.time()
+            # Frames the preview tick would never show are not worth resizing
+            now = time.perf_counter()
             min_interval = 1.0 / float(self.display_fps) if self.display_fps > 0 else 0
             if now - self._last_display_time < min_interval:
                 return
             self._last_display_time = now
 
-            # Resize frame for display (scale down 1080p to manageable size)
-            display_frame = cv2.resize(frame, (self.display_width, self.display_height), interpolation=cv2.INTER_LINEAR)
-
-            # Convert BGR to RGB
-            frame_rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-
-            # Convert to PIL Image (do NOT create PhotoImage off main thread)
-            pil_image = Image.fromarray(frame_rgb)
+            # Resize frame for display (scale down 1080p to manageable size) - AREA is both
+            # cheaper and cleaner than LINEAR when shrinking
+            back = 1 - self._preview_front
+            shrinking = frame.shape[1] > self.display_width or frame.shape[0] > self.display_height
+            cv2.resize(frame, (self.display_width, self.display_height), dst=self._preview_bufs[back],
+                       interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR)
 
-            # Schedule creation of PhotoImage in main thread
-            self.root.after(0, self._update_display, pil_image)
+            with self._preview_lock:
+                self._preview_front = back
+                self._preview_pending = True
 
         except Exception as e:
             self.log(f"❌ Display update error: {e}")
 
+    def _tk_preview_tick(self):
+        """Main-thread preview refresh at display_fps, converts only the newest frame"""
+        try:
+            with self._preview_lock:
+                fresh = self._preview_pending
+                if fresh:
+                    self._preview_pending = False
+                    # BGR → RGBA into the reused buffer while the vision thread can't swap it out
+                    cv2.cvtColor(self._preview_bufs[self._preview_front], cv2.COLOR_BGR2RGBA,
+                                 dst=self._rgb_buf)
+
+            if fresh:
+                # The mapped view is already current; PhotoImage.paste copies it straight into Tk
+                self._update_display(self._rgb_image)
+        except Exception as e:
+            self.log(f"❌ Preview tick error: {e}")
+        finally:
+            self.root.after(int(1000 / self.display_fps), self._tk_preview_tick)
+
     def _update_display(self, photo):
         """Update display in main thread"""
         try:
-            # If a PIL Image is passed, create PhotoImage here (main thread)
+            # Reuse one PhotoImage and paste new pixels instead of allocating per frame
             if isinstance(photo, Image.Image):
-                tk_photo = ImageTk.PhotoImage(photo)
+                if self._tk_photo is not None and self._tk_photo.width() == photo.width \
+                        and self._tk_photo.height() == photo.height:
+                    self._tk_photo.paste(photo)
+                else:
+                    self._tk_photo = ImageTk.PhotoImage(photo)
+                tk_photo = self._tk_photo
             else:
                 tk_photo = photo
 
-            self.video_canvas.configure(image=tk_photo, text='')
-            self.video_canvas.image = tk_photo
+            if getattr(self.video_canvas, 'image', None) is not tk_photo:
+                self.video_canvas.configure(image=tk_photo, text='')
+                self.video_canvas.image = tk_photo
         except Exception as e:
             self.log(f"❌ _update_display error: {e}")
     
     def update_detection_count(self, count):
         """Update detection counter"""
-        self.root.after(0, lambda: self.detection_label.config(text=f"Detections: {count}"))
+        self._post(self.detection_label.config, text=f"Detections: {count}")
+        
+    def _post(self, fn, *args, **kwargs):
+        """Queue a widget update for the main-thread UI pump (safe from any thread)"""
+        self._ui_q.put((fn, args, kwargs))
+
+    def _ui_pump(self):
+        """Main-thread tick: run every queued widget update, then reschedule"""
+        try:
+            while True:
+                try:
+                    fn, args, kwargs = self._ui_q.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    fn(*args, **kwargs)
+                except Exception as e:
+                    logger.error(f"UI update error: {e}")
+        finally:
+            self.root.after(self.ui_pump_interval_ms, self._ui_pump)
         
     def update_performance_display(self):
         """Update FPS and performance metrics"""
         # Keep gentle turn sequences flowing even if video loop paused
         self.process_turn_sequence()
 
-        current_time = time.time()
+        current_time = time.perf_counter()
         elapsed = current_time - self.fps_start_time
         
+        # Recompute (and touch the label) once a second, not on every 100 ms tick
         if elapsed >= 1.0:
             self.current_fps = self.fps_counter / elapsed
             self.fps_counter = 0
             self.fps_start_time = current_time
-            
-        self.fps_label.config(text=f"FPS: {self.current_fps:.1f}")
+            self.fps_label.config(text=self._fps_fmt(self.current_fps))
         
         # Schedule next update
         self.root.after(100, self.update_performance_display)
@@ -1992,29 +2423,33 @@ class WindowsAIController:
 
     def log(self, message):
         """Add message to log"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        now = int(time.time())
+        if now != _ts_cache[0]:
+            _ts_cache[1] = time.strftime("%H:%M:%S", time.localtime(now))
+            _ts_cache[0] = now
+        timestamp = _ts_cache[1]
         log_entry = f"[{timestamp}] {message}\n"
         
         # Update text widget in main thread if available
-        def update_log():
-            if hasattr(self, 'stats_text') and self.stats_text:
-                self.stats_text.insert(tk.END, log_entry)
-                self.stats_text.see(tk.END)
-                
-                # Keep only last 50 lines
-                lines = self.stats_text.get("1.0", tk.END).split('\n')
-                if len(lines) > 50:
-                    self.stats_text.delete("1.0", f"{len(lines)-50}.0")
-                    
         if hasattr(self, 'stats_text') and self.stats_text:
             if threading.current_thread() == threading.main_thread():
-                update_log()
+                self._append_log(log_entry)
             else:
-                self.root.after(0, update_log)
+                self._post(self._append_log, log_entry)
         
         # Always log to console/logger
         logger.info(message)
         print(f"[{timestamp}] {message}")  # Also print for immediate visibility
+
+    def _append_log(self, log_entry):
+        """Append one entry to the log widget (main thread only)"""
+        # Keep only the last 50 entries - drop the oldest entry's lines in place
+        if len(self._log_buf) == self._log_buf.maxlen:
+            oldest_lines = self._log_buf[0]
+            self.stats_text.delete("1.0", f"{oldest_lines + 1}.0")
+        self._log_buf.append(log_entry.count('\n'))
+        self.stats_text.insert(tk.END, log_entry)
+        self.stats_text.see(tk.END)
         
     def run(self):
         """Start the application"""
@@ -2035,7 +2470,7 @@ class WindowsAIController:
         """Periodic memory cleanup to prevent accumulation"""
         try:
             # Clean old detection history
-            now = time.time()
+            now = time.perf_counter()
             self.detection_history = collections.deque([
                 (ts, dets) for ts, dets in self.detection_history 
                 if now - ts <= self.detection_keep_seconds
@@ -2064,6 +2499,10 @@ class WindowsAIController:
         self.stop_tracking()
         self.stop_internet_streaming()
         
+        # Stop the detection process (if any)
+        if self.onnx_detector is not None and hasattr(self.onnx_detector, 'close'):
+            self.onnx_detector.close()
+
         # Final memory cleanup
         self.cleanup_memory()
         
@@ -117,7 +117,7 @@ class ReactBridgeWindowsController(WindowsAIController):
         url = f"{self.PI_BASE_URL.rstrip('/')}/assistant/speak"
         payload = {"text": cleaned, "async": async_mode}
         try:
-            response = requests.post(url, json=payload, timeout=6)
+            response = self._http.post(url, json=payload, timeout=6)
             if response.status_code >= 400:
                 try:
                     body = response.json()